@@ -0,0 +1,325 @@
+import argparse
+import asyncio
+import json
+import mimetypes
+import os
+import ssl
+import time
+from urllib.parse import urlencode, urlsplit
+
+import http_client
+import live_metrics
+import perf_log
+import test
+import upload_cache
+from test import LIST_ENDPOINTS, list_params, make_unique_filename
+from stats import summarize, fmt_seconds
+
+# Single-threaded asyncio engine: a small HTTP/1.1 keep-alive client on asyncio streams,
+# so thousands of requests can be in flight without threads or extra dependencies
+
+DEFAULT_LIMIT = 1000
+DEFAULT_TIMEOUT = 30
+# Safe to send again after a stale connection failed; a POST the server already read is not
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE")
+
+class AsyncResponse:
+    def __init__(self, status, headers, body, timing):
+        self.status_code = status
+        self.headers = headers
+        self.content = body
+        self.timing = timing
+        self.data = None  # Parsed JSON body, when parsed by Results.timed
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+class AsyncClient:
+    def __init__(self, base_url=None, limit=DEFAULT_LIMIT, timeout=DEFAULT_TIMEOUT):
+        self.base_url = (base_url or test.BASE_URL).rstrip("/")
+        parts = urlsplit(self.base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.host_header = parts.netloc
+        self.timeout = timeout
+        self.max_in_flight = limit
+        self.limit = asyncio.Semaphore(limit)
+        self.idle = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
+
+    async def _connection(self, fresh=False):
+        # Returns ((reader, writer), connect seconds, reused)
+        if self.idle and not fresh:
+            return self.idle.pop(), 0.0, True
+        start = time.perf_counter()
+        ctx = ssl.create_default_context() if self.scheme == "https" else None
+        conn = await asyncio.open_connection(self.host, self.port, ssl=ctx)
+        return conn, time.perf_counter() - start, False
+
+    async def request(self, method, path, params=None, json_body=None, data=None, headers=None, timeout=None):
+        # Enforces the concurrency limit and a per-request timeout; a timed out or cancelled
+        # request closes its connection rather than returning it to the pool. Fires the http_client
+        # hooks like http_client.request, so live_metrics covers async runs too.
+        async with self.limit:
+            info = {"method": method, "url": self.base_url + path, "stream": False, "start": time.perf_counter()}
+            http_client.fire_hooks("before", info)
+            try:
+                response = await asyncio.wait_for(
+                    self._send(method, path, params, json_body, data, headers or {}),
+                    timeout or self.timeout,
+                )
+            except BaseException as e:
+                # Includes cancellation at the end of a sweep, so in-flight counts return to zero
+                http_client.fire_hooks("error", info, e)
+                raise
+            http_client.fire_hooks("after", info, response, response.timing)
+            return response
+
+    async def _send(self, method, path, params, json_body, data, headers):
+        # data is bytes or a re-iterable of byte chunks with a len(), such as http_client.MultipartStream
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        target = path + ("?" + urlencode(params) if params else "")
+        headers = dict(headers)
+        if json_body is not None:
+            data = json.dumps(json_body).encode()
+            headers.setdefault("Content-Type", "application/json")
+        data = data or b""
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {self.host_header}",
+                 "Accept-Encoding: identity", f"Content-Length: {len(data)}"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+        start = time.perf_counter()
+        for attempt in range(2):
+            # A pooled connection the server closed while idle fails before any status line arrives;
+            # drop it and send once more on a fresh connection, unless the server may have already
+            # acted on a non-idempotent request that was fully written
+            (reader, writer), connect, reused = await self._connection(fresh=attempt > 0)
+            written = False
+            try:
+                await self._write(writer, head, data)
+                written = True
+                status_line = await reader.readline()
+                if not status_line:
+                    raise ConnectionResetError("Connection closed by server")
+                break
+            except BaseException as e:
+                # Also on cancellation (a timeout or the end of a run), so the connection is not leaked
+                writer.close()
+                retry = reused and (not written or method in IDEMPOTENT_METHODS)
+                if not (retry and isinstance(e, (ConnectionError, EOFError))):
+                    raise
+        reusable = False
+        try:
+            ttfb = time.perf_counter() - start
+            status = int(status_line.split()[1])
+            resp_headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                resp_headers[name.strip().title()] = value.strip()
+            body = await self._read_body(reader, resp_headers)
+            reusable = resp_headers.get("Connection", "").lower() != "close" and (
+                "Content-Length" in resp_headers or "chunked" in resp_headers.get("Transfer-Encoding", ""))
+        finally:
+            if reusable:
+                self.idle.append((reader, writer))
+            else:
+                writer.close()
+        total = time.perf_counter() - start
+        timing = {"connect": connect, "ttfb": ttfb, "server": max(ttfb - connect, 0.0), "total": total}
+        return AsyncResponse(status, resp_headers, body, timing)
+
+    @staticmethod
+    async def _write(writer, head, data):
+        if isinstance(data, bytes):
+            writer.write(head + data)
+            await writer.drain()
+            return
+        writer.write(head)
+        for chunk in data:
+            writer.write(chunk)
+            await writer.drain()
+        await writer.drain()
+
+    @staticmethod
+    async def _read_body(reader, headers):
+        if "chunked" in headers.get("Transfer-Encoding", "").lower():
+            parts = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    return b"".join(parts)
+                parts.append(await reader.readexactly(size))
+                await reader.readline()
+        if "Content-Length" in headers:
+            return await reader.readexactly(int(headers["Content-Length"]))
+        return await reader.read()
+
+# --- async counterparts of the test.py / file_test.py helpers ---
+
+async def make_request(client, method, path, params=None, body=None, quiet=True):
+    if method not in test.SUPPORTED_METHODS:
+        raise ValueError(f"Unsupported method: {method}")
+    json_body = body if method in ("POST", "PUT") else None
+    response = await client.request(method, path, params=params, json_body=json_body)
+    perf_log.record(path, method, params, response.status_code, len(response.content), response.timing)
+    if not quiet:
+        print(f"{method} {path} -> {response.status_code} in {response.timing['total']:.4f}s")
+    return response
+
+async def upload_files(client, file_paths, unique=True):
+    # Streams each file from disk in chunks rather than holding it in memory
+    parts, names = [], []
+    for path in file_paths:
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        name = make_unique_filename(os.path.basename(path)) if unique else os.path.basename(path)
+        parts.append(("files", name, path, content_type))
+        names.append(name)
+    body = http_client.MultipartStream(parts)
+    response = await client.request("POST", "/files/upload", data=body, headers={"Content-Type": body.content_type})
+    perf_log.record("/files/upload", "POST", None, response.status_code, len(response.content), response.timing)
+    return response, names
+
+async def handle_file_upload(client, file_path):
+    if not os.path.exists(file_path):
+        return None
+    digest = upload_cache.file_digest(file_path)
+    cached_url = upload_cache.lookup(digest, client.base_url)
+    if cached_url:
+        return cached_url
+    response, (name,) = await upload_files(client, [file_path])
+    if response.status_code != 200:
+        return None
+    result = response.json()
+    upload_url = result.get(name) or next(iter(result.values()), None)
+    if upload_url:
+        upload_cache.store(digest, upload_url, name, file_path, client.base_url)
+    return upload_url
+
+async def test_single_upload(client, file_path):
+    response, _ = await upload_files(client, [file_path], unique=False)
+    return response.json() if response.ok else None
+
+async def test_multiple_upload(client, file_paths):
+    response, _ = await upload_files(client, [p for p in file_paths if os.path.exists(p)], unique=False)
+    return response.json() if response.ok else None
+
+# --- load modes ---
+
+class Results:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def add(self, name, elapsed=None, error=False):
+        if elapsed is not None:
+            self.latencies.setdefault(name, []).append(elapsed)
+        if error:
+            self.errors[name] = self.errors.get(name, 0) + 1
+        self.latencies.setdefault(name, [])
+
+    async def timed(self, name, coro, parse_json=False):
+        # Any failure of one request (timeout, reset, truncated body, unparseable JSON) is counted as an
+        # error for that request instead of escaping into the surrounding gather
+        try:
+            response = await coro
+            if parse_json and response.ok:
+                response.data = response.json()
+            self.add(name, response.timing["total"], not response.ok)
+            return response
+        except (asyncio.TimeoutError, OSError, EOFError, ValueError, IndexError):
+            self.add(name, error=True)
+            return None
+
+    def report(self, elapsed):
+        print(f"\n{'Request':<26}{'Count':>8}{'Err':>7}{'Req/s':>9}{'p50':>11}{'p95':>11}{'p99':>11}")
+        for name, values in self.latencies.items():
+            s = summarize(values)
+            count = s["count"] + self.errors.get(name, 0)
+            print(f"{name:<26}{count:>8}{self.errors.get(name, 0):>7}{count / elapsed:>9.1f}"
+                  f"{fmt_seconds(s['p50']):>11}{fmt_seconds(s['p95']):>11}{fmt_seconds(s['p99']):>11}")
+
+async def deadline_rush(client, users, exam_no, student_start, results):
+    # Every virtual student submits /fill-form and then polls /get-form at the same moment
+    async def student(i):
+        body = {
+            "student": {"studentId": student_start + i},
+            "exam": {"examNo": exam_no},
+            "formData": "{}",
+            "status": "PENDING",
+        }
+        response = await results.timed("POST /fill-form", make_request(client, "POST", "/fill-form", body=body),
+                                       parse_json=True)
+        if response is not None and response.ok and isinstance(response.data, dict):
+            app_id = response.data.get("applicationId")
+            await results.timed("GET /get-form", make_request(
+                client, "GET", "/get-form", params={"applicationId": app_id, "examNo": exam_no}))
+    await asyncio.gather(*(student(i) for i in range(users)))
+
+async def sweep(client, duration, results):
+    # Keeps every list endpoint busy until the deadline, then cancels whatever is still in flight.
+    # The loops also check the deadline: asyncio.wait_for can swallow a cancellation that lands as its
+    # request completes (Python < 3.12), which would leave that loop running forever
+    deadline = time.perf_counter() + duration
+    async def loop(method, path):
+        while time.perf_counter() < deadline:
+            await results.timed(path, make_request(client, method, path, params=list_params(path)))
+    per_endpoint = max(client.max_in_flight // len(LIST_ENDPOINTS), 1)
+    tasks = [asyncio.create_task(loop(m, p)) for m, p in LIST_ENDPOINTS for _ in range(per_endpoint)]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def run(args):
+    results = Results()
+    start = time.perf_counter()
+    async with AsyncClient(args.base_url, limit=args.limit, timeout=args.timeout) as client:
+        if args.mode == "deadline":
+            await deadline_rush(client, args.users, args.exam_no, args.student_start, results)
+        else:
+            await sweep(client, args.duration, results)
+    results.report(time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="asyncio load engine for the harness endpoints")
+    parser.add_argument("mode", choices=("deadline", "sweep"),
+                        help="deadline: N students hit /fill-form then /get-form at once; sweep: list endpoints for --duration")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--exam-no", type=int, default=1)
+    parser.add_argument("--student-start", type=int, default=1, help="First studentId used by the virtual students")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Max requests in flight")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds")
+    parser.add_argument("--metrics-port", type=int, help="Serve live Prometheus metrics on this local port")
+    parser.add_argument("--live", type=float, metavar="SECONDS", help="Print a live summary line every SECONDS")
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+    with live_metrics.Exporter(args.metrics_port, args.live):
+        asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
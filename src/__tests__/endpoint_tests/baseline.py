@@ -0,0 +1,182 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import perf_log
+import test
+from test import LIST_ENDPOINTS, list_params, send_request, log_performance
+from stats import percentile, fmt_seconds
+
+BASELINE_DIR = os.environ.get("BASELINE_DIR", "baselines")
+MIN_SAMPLES = 5
+ALPHA = 0.05
+
+def collect(repeats, endpoints=None, include_cold=False):
+    # Runs the list sweep into the perf log and returns this run's ID. The first hit of each request is
+    # tagged cold and dropped from the samples unless include_cold, so that sweep comes on top of
+    # `repeats` to leave `repeats` usable samples per endpoint
+    sweeps = repeats if include_cold else repeats + 1
+    for i in range(sweeps):
+        print(f"Sweep {i + 1}/{sweeps}...")
+        for method, path in endpoints or LIST_ENDPOINTS:
+            params = list_params(path)
+            try:
+                response, timing = send_request(method, path, params=params)
+                log_performance(path, method, params, response, timing)
+            except Exception as e:
+                print(f"{path}: Error: {e}")
+    perf_log.flush()
+    return perf_log.RUN_ID
+
+def latest_run(records):
+    runs = perf_log.list_runs(records)
+    return max(runs, key=lambda r: runs[r]["start"]) if runs else None
+
+def samples_by_endpoint(records, run_id, metric="total", include_cold=False):
+    samples = {}
+    for r in records:
+        if r["run_id"] != run_id or r["status"] is None or r["status"] >= 400 or r.get(metric) is None:
+            continue
+        if r.get("cache") == "cold" and not include_cold:
+            continue
+        samples.setdefault(f"{r['method']} {r['endpoint']}", []).append(r[metric])
+    return samples
+
+def mann_whitney_p(a, b):
+    # Two-sided Mann-Whitney U p-value, normal approximation with tie correction
+    n1, n2 = len(a), len(b)
+    combined = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    ranks = [0.0] * len(combined)
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    r1 = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    var = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if var <= 0:
+        return 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(var)
+    return math.erfc(max(z, 0) / math.sqrt(2))
+
+def save_baseline(name, samples, run_id, metric):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = os.path.join(BASELINE_DIR, f"{name}.json")
+    with open(path, "w") as f:
+        json.dump({"name": name, "run_id": run_id, "metric": metric, "saved": time.time(),
+                   "samples": samples}, f, indent=4)
+    print(f"Baseline '{name}' saved to {path} ({len(samples)} endpoints from run {run_id})")
+
+def load_baseline(name):
+    with open(os.path.join(BASELINE_DIR, f"{name}.json")) as f:
+        return json.load(f)
+
+def compare(base_samples, new_samples, tolerance, p95_tolerance):
+    rows = []
+    for endpoint in sorted(set(base_samples) | set(new_samples)):
+        base, new = base_samples.get(endpoint, []), new_samples.get(endpoint, [])
+        row = {"endpoint": endpoint, "n_base": len(base), "n_new": len(new), "status": "ok"}
+        if not base or not new:
+            row["status"] = "MISSING in " + ("baseline" if not base else "new run")
+            rows.append(row)
+            continue
+        row.update({
+            "base_p50": percentile(base, 50), "new_p50": percentile(new, 50),
+            "base_p95": percentile(base, 95), "new_p95": percentile(new, 95),
+        })
+        row["p50_change"] = row["new_p50"] / row["base_p50"] - 1 if row["base_p50"] else 0
+        row["p95_change"] = row["new_p95"] / row["base_p95"] - 1 if row["base_p95"] else 0
+        if len(base) < MIN_SAMPLES or len(new) < MIN_SAMPLES:
+            row["p_value"] = None
+            row["status"] = "TOO FEW SAMPLES"
+        else:
+            row["p_value"] = mann_whitney_p(base, new)
+            significant = row["p_value"] < ALPHA
+            if significant and row["p50_change"] > tolerance:
+                row["status"] = "REGRESSION"
+            elif significant and row["p95_change"] > p95_tolerance:
+                row["status"] = "REGRESSION (p95)"
+            elif significant and row["p50_change"] < -tolerance:
+                row["status"] = "improved"
+        rows.append(row)
+    return rows
+
+def print_diff(rows):
+    print(f"\n{'Endpoint':<30}{'Base p50':>10}{'New p50':>10}{'Δ p50':>8}{'Base p95':>10}{'New p95':>10}"
+          f"{'Δ p95':>8}{'p':>8}  Status")
+    for r in rows:
+        if "base_p50" not in r:
+            print(f"{r['endpoint']:<30}{'':>64}  {r['status']} (base {r['n_base']}, new {r['n_new']})")
+            continue
+        p = f"{r['p_value']:.3f}" if r["p_value"] is not None else "-"
+        print(f"{r['endpoint']:<30}{fmt_seconds(r['base_p50']):>10}{fmt_seconds(r['new_p50']):>10}"
+              f"{r['p50_change']:>+8.0%}{fmt_seconds(r['base_p95']):>10}{fmt_seconds(r['new_p95']):>10}"
+              f"{r['p95_change']:>+8.0%}{p:>8}  {r['status']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Save latency baselines and gate new runs against them")
+    parser.add_argument("--log", default=perf_log.PERF_LOG_PATH)
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("save", "compare"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("name", help="Baseline name")
+        cmd.add_argument("--run", help="Run ID from the perf log (default: latest run)")
+        cmd.add_argument("--collect", type=int, metavar="N", help="Run the list sweep N times now and use that run")
+        cmd.add_argument("--metric", default="total", choices=("total", "server", "ttfb"))
+        cmd.add_argument("--include-cold", action="store_true", help="Keep first (cold cache) hits in the samples")
+    compare_cmd = sub.choices["compare"]
+    compare_cmd.add_argument("--tolerance", type=float, default=0.2, help="Allowed median slowdown (0.2 = 20%%)")
+    compare_cmd.add_argument("--p95-tolerance", type=float, default=0.5, help="Allowed p95 slowdown")
+    args = parser.parse_args()
+    if args.collect is not None and args.collect < MIN_SAMPLES:
+        parser.error(f"--collect needs at least {MIN_SAMPLES} samples per endpoint to compare")
+
+    test.BASE_URL = args.base_url
+    if args.collect:
+        perf_log.PERF_LOG_PATH = args.log
+        run_id = collect(args.collect, include_cold=args.include_cold)
+    else:
+        run_id = args.run
+    records = perf_log.load_records(args.log)
+    run_id = run_id or latest_run(records)
+    if not run_id:
+        print(f"No runs found in {args.log}")
+        sys.exit(2)
+    samples = samples_by_endpoint(records, run_id, args.metric, args.include_cold)
+
+    if args.command == "save":
+        save_baseline(args.name, samples, run_id, args.metric)
+        return
+
+    baseline = load_baseline(args.name)
+    if baseline["metric"] != args.metric:
+        print(f"Warning: baseline measured '{baseline['metric']}', comparing '{args.metric}'")
+    rows = compare(baseline["samples"], samples, args.tolerance, args.p95_tolerance)
+    print(f"Run {run_id} vs baseline '{args.name}' (run {baseline['run_id']})")
+    print_diff(rows)
+    # The gate fails closed: an endpoint that cannot be compared is not a pass
+    regressions = [r for r in rows if r["status"].startswith("REGRESSION")]
+    unchecked = [r for r in rows if r["status"].startswith(("MISSING", "TOO FEW"))]
+    if unchecked:
+        print(f"\n{len(unchecked)} endpoint(s) could not be compared (need {MIN_SAMPLES} samples on both sides)")
+    if regressions:
+        print(f"\n{len(regressions)} endpoint(s) regressed past tolerance")
+    if regressions or unchecked:
+        sys.exit(1)
+    print("\nNo regressions")
+
+if __name__ == "__main__":
+    main()
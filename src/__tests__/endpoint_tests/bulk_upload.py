@@ -0,0 +1,151 @@
+import argparse
+import json
+import mimetypes
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import http_client
+import test
+import upload_cache
+from test import make_unique_filename, log_performance
+
+# Files below SMALL_FILE_BYTES are grouped into one multipart request, up to these limits
+SMALL_FILE_BYTES = 1024 * 1024
+BATCH_MAX_FILES = 10
+BATCH_MAX_BYTES = 8 * 1024 * 1024
+
+def collect_files(source):
+    # A directory (walked recursively) or a manifest: JSON list of paths or one path per line
+    if os.path.isdir(source):
+        paths = []
+        for root, _, names in os.walk(source):
+            paths.extend(os.path.join(root, n) for n in sorted(names))
+        return paths
+    with open(source) as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        paths = json.loads(text)
+    else:
+        paths = [line.strip() for line in text.splitlines() if line.strip() and not line.startswith("#")]
+    base = os.path.dirname(os.path.abspath(source))
+    return [p if os.path.isabs(p) else os.path.join(base, p) for p in paths]
+
+def make_batches(paths):
+    batches, current, current_bytes = [], [], 0
+    for path in paths:
+        size = os.path.getsize(path)
+        if size >= SMALL_FILE_BYTES:
+            batches.append([path])
+            continue
+        if current and (len(current) >= BATCH_MAX_FILES or current_bytes + size > BATCH_MAX_BYTES):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(path)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+def content_type_for(path):
+    content_type, _ = mimetypes.guess_type(path)
+    return content_type or "application/octet-stream"
+
+def upload_batch(paths, digests=None):
+    # Returns ({path: url or None}, bytes sent), streaming every file body from disk
+    names = {path: make_unique_filename(os.path.basename(path)) for path in paths}
+    body = http_client.MultipartStream(
+        [("files", names[p], p, content_type_for(p)) for p in paths]
+    )
+    url = f"{test.BASE_URL}/files/upload"
+    response, timing = http_client.request(
+        "POST", url, data=body, headers={"Content-Type": body.content_type}
+    )
+    log_performance("/files/upload", "POST", None, response, timing)
+    result = {}
+    try:
+        urls = response.json() if response.status_code == 200 else {}
+    except ValueError:
+        urls = {}
+    for path in paths:
+        result[path] = urls.get(names[path]) if isinstance(urls, dict) else None
+        if result[path] and digests:
+            upload_cache.store(digests[path], result[path], names[path], path, test.BASE_URL)
+    if response.status_code != 200:
+        print(f"Batch of {len(paths)} failed: {response.status_code} - {response.text[:200]}")
+    return result, body.bytes_sent
+
+def bulk_upload(paths, workers=4, use_cache=True):
+    uploaded, failed = {}, []
+    totals = {"bytes": 0, "files": 0}
+    start = time.time()
+
+    digests = {}
+    if use_cache:
+        pending = []
+        for path in paths:
+            digests[path] = upload_cache.file_digest(path)
+            cached_url = upload_cache.lookup(digests[path], test.BASE_URL)
+            if cached_url:
+                uploaded[path] = cached_url
+            else:
+                pending.append(path)
+        if uploaded:
+            print(f"{len(uploaded)} files unchanged since last upload (cache hits)")
+        paths_to_send = pending
+    else:
+        paths_to_send = paths
+
+    batches = make_batches(paths_to_send)
+    print(f"Uploading {len(paths_to_send)} files in {len(batches)} requests with {workers} workers...")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(upload_batch, batch, digests): batch for batch in batches}
+        for future in as_completed(futures):
+            try:
+                result, sent = future.result()
+            except Exception as e:
+                print(f"Error: {e}")
+                failed.extend(futures[future])
+                continue
+            totals["bytes"] += sent
+            for path, url in result.items():
+                if url:
+                    uploaded[path] = url
+                    totals["files"] += 1
+                else:
+                    failed.append(path)
+            elapsed = time.time() - start
+            print(f"  {totals['files']}/{len(paths_to_send)} files, "
+                  f"{totals['bytes'] / elapsed / 1e6:.2f} MB/s, {totals['files'] / elapsed:.1f} files/s")
+
+    elapsed = time.time() - start
+    print(f"\nUploaded {totals['files']} files ({totals['bytes'] / 1e6:.2f} MB) in {elapsed:.2f}s: "
+          f"{totals['bytes'] / elapsed / 1e6:.2f} MB/s, {totals['files'] / elapsed:.1f} files/s, {len(failed)} failed")
+    return uploaded, failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel bulk upload to /files/upload")
+    parser.add_argument("source", help="Directory to upload, or a manifest file listing paths")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--results", default=os.path.join("output", "bulk_upload_results.json"),
+                        help="Where to write the path -> URL map")
+    parser.add_argument("--no-cache", action="store_true", help="Upload even if the content was uploaded before")
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    http_client.configure(pool_size=args.workers)
+    paths = [p for p in collect_files(args.source) if os.path.isfile(p)]
+    if not paths:
+        print("No files to upload.")
+        return
+    uploaded, failed = bulk_upload(paths, args.workers, use_cache=not args.no_cache)
+
+    os.makedirs(os.path.dirname(args.results) or ".", exist_ok=True)
+    with open(args.results, "w") as f:
+        json.dump({"uploaded": uploaded, "failed": failed}, f, indent=4)
+    print(f"Results saved to {args.results}")
+
+if __name__ == "__main__":
+    main()
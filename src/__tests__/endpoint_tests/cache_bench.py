@@ -0,0 +1,90 @@
+import argparse
+import sys
+
+import test
+from test import LIST_ENDPOINTS, list_params, send_request, log_performance
+from stats import percentile, fmt_seconds
+
+# A repeat is only counted as a cache hit if it is at least this many times faster than the first hit
+MIN_SPEEDUP = 3.0
+
+def bench_endpoint(method, path, repeats):
+    # Returns the timings, or {"error": ...} when a request raises or returns an error status
+    params = list_params(path)
+    timings = []
+    for i in range(repeats):
+        try:
+            response, timing = send_request(method, path, params=params)
+        except Exception as e:
+            print(f"Error on {path}: {e}")
+            return {"error": str(e)}
+        log_performance(path, method, params, response, timing, cache="cold" if i == 0 else "warm")
+        if response.status_code >= 400:
+            print(f"{path} returned {response.status_code}")
+            return {"error": f"HTTP {response.status_code}"}
+        timings.append(timing["total"])
+    first = timings[0]
+    steady = percentile(timings[1:], 50) if len(timings) > 1 else None
+    return {
+        "first": first,
+        "steady": steady,
+        "steady_p95": percentile(timings[1:], 95),
+        "speedup": first / steady if steady else None,
+    }
+
+def run_cache_bench(endpoints=None, repeats=5, max_warm=None):
+    endpoints = endpoints or LIST_ENDPOINTS
+    results = {}
+    for method, path in endpoints:
+        print(f"Benchmarking {method} {path} x{repeats}...")
+        row = bench_endpoint(method, path, repeats)
+        if "error" in row:
+            results[path] = row
+            continue
+        row["uncached"] = row["speedup"] is not None and row["speedup"] < MIN_SPEEDUP
+        row["too_slow"] = max_warm is not None and row["steady"] is not None and row["steady"] > max_warm
+        results[path] = row
+    return results
+
+def print_summary(results):
+    print(f"\n{'Endpoint':<26}{'First':>11}{'Steady p50':>12}{'Steady p95':>12}{'Speedup':>9}  Flags")
+    for path, row in results.items():
+        if "error" in row:
+            print(f"{path:<26}{'ERROR':>11}  {row['error']}")
+            continue
+        flags = []
+        if row["uncached"]: flags.append("NOT CACHED")
+        if row["too_slow"]: flags.append("SLOW")
+        speedup = f"{row['speedup']:.1f}x" if row["speedup"] else "-"
+        print(f"{path:<26}{fmt_seconds(row['first']):>11}{fmt_seconds(row['steady']):>12}"
+              f"{fmt_seconds(row['steady_p95']):>12}{speedup:>9}  {' '.join(flags)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs warm cache benchmark over the list endpoints")
+    parser.add_argument("--repeats", type=int, default=5, help="Requests per endpoint, the first is the cold hit")
+    parser.add_argument("--max-warm", type=float, help="Fail if any steady-state p50 exceeds this many seconds")
+    parser.add_argument("--fail-uncached", action="store_true", help="Fail if any endpoint shows no cache speedup")
+    parser.add_argument("--endpoint", action="append", help="Limit to these paths (repeatable)")
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    if args.repeats < 2:
+        parser.error("--repeats must be at least 2 to compare first hit with repeats")
+    test.BASE_URL = args.base_url
+    endpoints = [e for e in LIST_ENDPOINTS if not args.endpoint or e[1] in args.endpoint]
+    results = run_cache_bench(endpoints, args.repeats, args.max_warm)
+    print_summary(results)
+
+    # Fails closed: an endpoint that could not be measured is not a pass
+    errors = [p for p, r in results.items() if "error" in r]
+    failed = [p for p, r in results.items()
+              if "error" not in r and (r["too_slow"] or (args.fail_uncached and r["uncached"]))]
+    if errors:
+        print(f"\nERROR: {', '.join(errors)} could not be measured")
+    if failed:
+        print(f"\nFAILED: {', '.join(failed)}")
+    if errors or failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
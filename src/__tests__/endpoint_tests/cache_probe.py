@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import test
+from test import send_request, log_performance
+from profiler import records_of
+from seed import student_payload, profile_payload, application_payload, result_payload
+from stats import fmt_seconds
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_INTERVAL = 0.1
+
+class ProbeError(Exception):
+    pass
+
+class Read:
+    # One list or detail endpoint polled after a write until `visible(data)` holds
+    def __init__(self, path, params=None, visible=None):
+        self.path = path
+        self.params = params
+        self.visible = visible
+        self.warm = None
+        self.after = None
+        self.after_cache = None
+        self.visible_after = None
+        self.polls = 0
+
+    @property
+    def label(self):
+        query = "&".join(f"{k}={v}" for k, v in (self.params or {}).items())
+        return f"{self.path}?{query}" if query else self.path
+
+def fetch(path, params=None):
+    response, timing = send_request("GET", path, params=params)
+    log_performance(path, "GET", params, response, timing)
+    data = response.json() if response.status_code == 200 and response.content else None
+    return data, timing["total"], response.headers.get("X-Cache")
+
+def write(method, path, params=None, body=None):
+    response, timing = send_request(method, path, params=params, body=body)
+    log_performance(path, method, params, response, timing)
+    if response.status_code >= 400:
+        raise ProbeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+    return (response.json() if response.content else None), timing["total"]
+
+def record_id(data, id_field):
+    return data.get(id_field, data.get("id")) if isinstance(data, dict) else None
+
+def has_record(id_field, value, check=None):
+    def visible(data):
+        return any(r.get(id_field) == value and (check is None or check(r))
+                   for r in records_of(data) if isinstance(r, dict))
+    return visible
+
+def lacks_record(id_field, value):
+    present = has_record(id_field, value)
+    return lambda data: not present(data)
+
+def warm_up(reads):
+    # Two reads so the second one is served from a warm cache; its latency is the pre-write baseline
+    for read in reads:
+        fetch(read.path, read.params)
+        _, read.warm, _ = fetch(read.path, read.params)
+
+def poll(reads, written_at, timeout, interval):
+    pending = list(reads)
+    deadline = written_at + timeout
+    while pending and time.perf_counter() < deadline:
+        for read in list(pending):
+            data, elapsed, cache = fetch(read.path, read.params)
+            read.polls += 1
+            if read.after is None:
+                read.after, read.after_cache = elapsed, cache
+            if read.visible(data):
+                read.visible_after = time.perf_counter() - written_at
+                pending.remove(read)
+        if pending:
+            time.sleep(interval)
+    return reads
+
+def find_first(path, params):
+    data, _, _ = fetch(path, params)
+    records = records_of(data)
+    if not records:
+        raise ProbeError(f"{path} returned no records to probe with")
+    return records[0]
+
+# --- probes: each warms its reads, performs one write and polls until the change shows up ---
+
+def probe_add_student(rng, timeout, interval):
+    school = find_first("/schools", {"size": 1})
+    lists = [Read("/students", {"sort": "studentId,desc", "size": 20}), Read("/getAllStudents")]
+    warm_up(lists)
+    body = student_payload(rng, rng.randrange(10 ** 6), rng.randrange(10 ** 6))
+    data, write_time = write("POST", "/addStudent", params={"schoolId": school["schoolId"]}, body=body)
+    written_at = time.perf_counter()
+    new_id = record_id(data, "studentId")
+    for read in lists:
+        read.visible = has_record("studentId", new_id)
+    reads = lists + [Read("/getStudent", {"id": new_id}, has_record("studentId", new_id))]
+    return write_time, poll(reads, written_at, timeout, interval)
+
+def probe_update_exam(rng, timeout, interval):
+    exam = find_first("/exams", {"size": 1})
+    exam_no = exam["examNo"]
+    new_name = f"{exam['exam_name'].split(' [probe')[0]} [probe {rng.randrange(10 ** 6)}]"
+    renamed = has_record("examNo", exam_no, lambda r: r.get("exam_name") == new_name)
+    reads = [Read("/exams", {"sort": "examNo,asc", "size": 20}, renamed),
+             Read("/exams/all", visible=renamed),
+             Read(f"/exams/{exam_no}", visible=renamed)]
+    warm_up(reads)
+    try:
+        _, write_time = write("PUT", "/exams", body=dict(exam, exam_name=new_name))
+        return write_time, poll(reads, time.perf_counter(), timeout, interval)
+    finally:
+        # The exam is real data: put its original name back even if the probe failed part way
+        write("PUT", "/exams", body=exam)
+
+def probe_delete_profile(rng, timeout, interval):
+    student = find_first("/students", {"size": 1})
+    created, _ = write("POST", "/addStudentProfile", params={"studentId": student["studentId"]},
+                       body=profile_payload(rng, student, rng.randrange(10 ** 6)))
+    profile_id = record_id(created, "profileId")
+    gone = lacks_record("profileId", profile_id)
+    reads = [Read(f"/studentProfiles/{profile_id}", visible=gone),
+             Read("/getAllStudentProfiles", visible=gone)]
+    warm_up(reads)
+    _, write_time = write("DELETE", f"/studentProfiles/{profile_id}")
+    return write_time, poll(reads, time.perf_counter(), timeout, interval)
+
+def probe_add_result(rng, timeout, interval):
+    # A fresh application has no result yet, so /getExamResult can only return the new one
+    template = find_first("/exam-applications", {"size": 1})
+    application, _ = write("POST", "/fill-form",
+                           body=application_payload(rng, template["studentId"], template["examNo"]))
+    app_id = record_id(application, "applicationId")
+    reads = [Read("/getAllResults"), Read("/exam-results", {"sort": "id,desc", "size": 20}),
+             Read("/getStudentResults", {"studentId": template["studentId"]})]
+    warm_up(reads)
+    data, write_time = write("POST", "/addExamResult", body=result_payload(rng, app_id))
+    written_at = time.perf_counter()
+    new_id = record_id(data, "id")
+    for read in reads:
+        read.visible = has_record("id", new_id)
+    reads.append(Read("/getExamResult", {"applicationId": app_id}, has_record("id", new_id)))
+    return write_time, poll(reads, written_at, timeout, interval)
+
+PROBES = {
+    "add-student": ("POST /addStudent", probe_add_student),
+    "update-exam": ("PUT /exams", probe_update_exam),
+    "delete-profile": ("DELETE /studentProfiles/{id}", probe_delete_profile),
+    "add-result": ("POST /addExamResult", probe_add_result),
+}
+
+def summarize_reads(reads):
+    return [{
+        "read": read.label,
+        "visible": read.visible_after is not None,
+        "visible_after": read.visible_after,
+        "polls": read.polls,
+        "warm": read.warm,
+        "first_read": read.after,
+        "first_read_cache": read.after_cache,
+        "penalty": read.after / read.warm if read.after and read.warm else None,
+    } for read in reads]
+
+def print_report(results, timeout):
+    print(f"\n{'Write':<30}{'Read':<42}{'Visible':>10}{'Polls':>6}{'Warm':>10}{'1st read':>10}"
+          f"{'Cache':>6}{'Penalty':>8}")
+    stale = 0
+    for write_label, result in results.items():
+        if "error" in result:
+            print(f"{write_label:<30}Error: {result['error']}")
+            continue
+        for row in result["reads"]:
+            if not row["visible"]:
+                stale += 1
+            visible = fmt_seconds(row["visible_after"]) if row["visible"] else "STALE"
+            penalty = f"{row['penalty']:.1f}x" if row["penalty"] else "-"
+            print(f"{write_label:<30}{row['read']:<42}{visible:>10}{row['polls']:>6}"
+                  f"{fmt_seconds(row['warm']):>10}{fmt_seconds(row['first_read']):>10}"
+                  f"{row['first_read_cache'] or '-':>6}{penalty:>8}")
+            write_label = ""
+    if stale:
+        print(f"\n{stale} read(s) still served stale data {timeout}s after the write")
+    return stale
+
+def main():
+    parser = argparse.ArgumentParser(description="Write-then-read probe of cache invalidation and its read cost")
+    parser.add_argument("--probe", action="append", choices=sorted(PROBES), help="Run only these probes (repeatable)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds to wait for a change to show")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="Seconds between poll rounds")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default=os.path.join("output", "cache_probe.json"))
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    rng = random.Random(args.seed)
+    results = {}
+    for name in args.probe or PROBES:
+        label, probe = PROBES[name]
+        print(f"Probing {label}...")
+        try:
+            write_time, reads = probe(rng, args.timeout, args.interval)
+            results[label] = {"write": write_time, "reads": summarize_reads(reads)}
+        except Exception as e:
+            results[label] = {"error": str(e)}
+    stale = print_report(results, args.timeout)
+    errors = [label for label, result in results.items() if "error" in result]
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nProbe results saved to {args.out}")
+    if errors:
+        print(f"{len(errors)} probe(s) failed: {', '.join(errors)}")
+    if stale or errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
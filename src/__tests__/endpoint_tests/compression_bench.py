@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import statistics
+import time
+import zlib
+
+import test
+from test import LIST_ENDPOINTS, list_params, send_request, log_performance
+from profiler import CHUNK
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MIN_SAVING = 0.3  # Recommend server-side compression when it would cut at least 30% of the bytes
+MIN_BYTES = 2048  # Spring's default server.compression.min-response-size
+
+def _gzip_compress(data):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+# Content-Encoding -> (compress, decompress); br and zstd only when their libraries are installed
+CODECS = {
+    "identity": (lambda data: data, lambda data: data),
+    "gzip": (_gzip_compress, lambda data: zlib.decompress(data, 47)),
+    "deflate": (zlib.compress, lambda data: zlib.decompress(data, 47)),
+}
+if brotli is not None:
+    CODECS["br"] = (brotli.compress, brotli.decompress)
+if zstandard is not None:
+    CODECS["zstd"] = (zstandard.ZstdCompressor().compress,
+                      lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data))
+
+def fetch(method, path, params, encoding):
+    response, timing = send_request(method, path, params=params, stream=True,
+                                    headers={"Accept-Encoding": encoding})
+    with response:
+        served = response.headers.get("Content-Encoding", "identity").lower()
+        start = time.perf_counter()
+        wire = b"".join(response.raw.stream(CHUNK, decode_content=False))
+        download = time.perf_counter() - start
+    if served not in CODECS:
+        raise ValueError(f"Server answered with unsupported Content-Encoding: {served}")
+    start = time.perf_counter()
+    body = CODECS[served][1](wire)
+    decode = time.perf_counter() - start
+    timing["total"] += download + decode
+    log_performance(path, method, params, response, timing, size=len(body))
+    return {"served": served, "wire": len(wire), "body": body, "ttfb": timing["ttfb"],
+            "download": download, "decode": decode, "total": timing["total"]}
+
+def bench_endpoint(method, path, params, encodings, repeats):
+    rows = {}
+    for encoding in encodings:
+        samples = [fetch(method, path, params, encoding) for _ in range(repeats)]
+        last = samples[-1]
+        row = {
+            "served": last["served"],
+            "bytes": len(last["body"]),
+            "wire_bytes": last["wire"],
+            "decode": statistics.median(s["decode"] for s in samples),
+            "total": statistics.median(s["total"] for s in samples),
+            "estimated": False,
+        }
+        if encoding != "identity" and last["served"] == "identity":
+            # Not negotiated: estimate what the encoding would save on this exact body
+            compress, decompress = CODECS[encoding]
+            packed = compress(last["body"])
+            start = time.perf_counter()
+            decompress(packed)
+            row.update(wire_bytes=len(packed), decode=time.perf_counter() - start, estimated=True)
+        rows[encoding] = row
+    return rows
+
+def recommend(rows):
+    identity = rows["identity"]
+    best = min((e for e in rows if e != "identity"), key=lambda e: rows[e]["wire_bytes"], default=None)
+    if best is None or identity["bytes"] < MIN_BYTES:
+        return None
+    saving = 1 - rows[best]["wire_bytes"] / identity["bytes"]
+    negotiated = any(r["served"] != "identity" for r in rows.values())
+    if saving >= MIN_SAVING and not negotiated:
+        return {"encoding": best, "saving": saving,
+                "saved_bytes": identity["bytes"] - rows[best]["wire_bytes"]}
+    return None
+
+def print_report(results, encodings):
+    header = f"{'Endpoint':<24}{'Bytes':>10}"
+    for encoding in encodings[1:]:
+        header += f"{encoding + ' wire':>14}{'decode':>9}"
+    print(f"\n{header}{'identity total':>16}  Served")
+    for path, rows in results.items():
+        line = f"{path:<24}{rows['identity']['bytes']:>10}"
+        for encoding in encodings[1:]:
+            row = rows[encoding]
+            mark = "~" if row["estimated"] else " "
+            line += f"{row['wire_bytes']:>13}{mark}{row['decode'] * 1000:>7.2f}ms"
+        served = sorted({r["served"] for r in rows.values()})
+        print(f"{line}{rows['identity']['total']:>15.3f}s  {', '.join(served)}")
+    print("~ = server did not compress; size and decode time estimated locally from the identity body")
+
+    findings = [(path, rec) for path, rows in results.items() if (rec := recommend(rows))]
+    if findings:
+        print("\nWould benefit from server-side compression:")
+        for path, rec in sorted(findings, key=lambda f: f[1]["saved_bytes"], reverse=True):
+            print(f"  {path}: {rec['encoding']} saves {rec['saving']:.0%} "
+                  f"({rec['saved_bytes'] / 1024:.1f} KB per response)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare identity, gzip, br and zstd responses per list endpoint")
+    parser.add_argument("--endpoint", action="append", help="Limit to these paths (repeatable)")
+    parser.add_argument("--encoding", action="append", choices=sorted(CODECS),
+                        help="Encodings to try (default: every one available)")
+    parser.add_argument("--repeats", type=int, default=3, help="Requests per encoding (median is reported)")
+    parser.add_argument("--out", default=os.path.join("output", "compression.json"))
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    encodings = ["identity"] + [e for e in (args.encoding or CODECS) if e != "identity"]
+    missing = [name for name, lib in (("br", brotli), ("zstd", zstandard)) if lib is None]
+    if missing:
+        print(f"Skipping {', '.join(missing)} (pip install brotli zstandard to include them)")
+    results = {}
+    for method, path in LIST_ENDPOINTS:
+        if args.endpoint and path not in args.endpoint:
+            continue
+        try:
+            results[path] = bench_endpoint(method, path, list_params(path), encodings, args.repeats)
+        except Exception as e:
+            print(f"{path}: Error: {e}")
+    print_report(results, encodings)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({path: {"encodings": rows, "recommendation": recommend(rows)} for path, rows in results.items()},
+                  f, indent=4)
+    print(f"\nResults saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
-import requests
 import os
 import sys
 import mimetypes
 
-BASE_URL = "http://localhost:8080"
+import http_client
+import upload_cache
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8080")
 
 def test_single_upload(file_path):
     print(f"\n--- Testing Single File Upload: {file_path} ---")
@@ -20,9 +22,10 @@ def test_single_upload(file_path):
     with open(file_path, 'rb') as f:
         # Format: (field_name, (filename, file_object, content_type))
         files = [('files', (os.path.basename(file_path), f, content_type))]
-        response = requests.post(url, files=files)
+        response, timing = http_client.request("POST", url, files=files)
     
     print(f"Status Code: {response.status_code}")
+    print(f"Time Taken: {timing['total']:.4f}s (connect {timing['connect']:.4f}s, server {timing['server']:.4f}s)")
     try:
         print(f"Response: {response.json()}")
         return response.json()
@@ -51,8 +54,9 @@ def test_multiple_upload(file_paths):
             print("No valid files to upload.")
             return
 
-        response = requests.post(url, files=files)
+        response, timing = http_client.request("POST", url, files=files)
         print(f"Status Code: {response.status_code}")
+        print(f"Time Taken: {timing['total']:.4f}s (connect {timing['connect']:.4f}s, server {timing['server']:.4f}s)")
         try:
             print(f"Response: {response.json()}")
             return response.json()
@@ -67,8 +71,12 @@ def test_delete_file(filename):
     url = f"{BASE_URL}/files/upload"
     params = {'objectName': filename}
     
-    response = requests.delete(url, params=params)
+    response, _ = http_client.request("DELETE", url, params=params)
     print(f"Status Code: {response.status_code}")
+    if response.ok:
+        removed = upload_cache.invalidate(filename, BASE_URL)
+        if removed:
+            print(f"Dropped {removed} upload cache entries for {filename}")
     try:
         print(f"Response: {response.json()}")
     except:
@@ -0,0 +1,162 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+import file_test
+import http_client
+import test
+from test import log_performance, make_unique_filename
+from stats import summarize, fmt_seconds
+
+# Larger buckets (e.g. --sizes ...,500MB) are opt-in: the mock server holds each upload in memory
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB,100MB"
+UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+WRITE_CHUNK = 1024 * 1024
+READ_CHUNK = 256 * 1024
+
+def parse_size(text):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)\s*(B|KB|MB|GB)?", text.strip().upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Bad size: {text}")
+    return int(float(match.group(1)) * UNITS[match.group(2) or "B"])
+
+def fmt_size(size):
+    for unit in ("GB", "MB", "KB"):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return f"{size // UNITS[unit]}{unit}"
+    return f"{size}B"
+
+def generate_file(directory, size):
+    # Random (incompressible) content written in chunks; returns (path, sha256)
+    path = os.path.join(directory, f"throughput_{fmt_size(size)}.bin")
+    digest = hashlib.sha256()
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining:
+            chunk = os.urandom(min(WRITE_CHUNK, remaining))
+            digest.update(chunk)
+            f.write(chunk)
+            remaining -= len(chunk)
+    return path, digest.hexdigest()
+
+def upload(path):
+    name = make_unique_filename(os.path.basename(path))
+    body = http_client.MultipartStream([("files", name, path, "application/octet-stream")])
+    response, timing = http_client.request("POST", f"{test.BASE_URL}/files/upload", data=body,
+                                           headers={"Content-Type": body.content_type})
+    log_performance("/files/upload", "POST", None, response, timing)
+    if response.status_code != 200:
+        raise RuntimeError(f"Upload returned {response.status_code}: {response.text[:200]}")
+    urls = response.json()
+    return name, urls.get(name) or next(iter(urls.values())), timing["total"]
+
+def download(url, range_size=0):
+    # Streams the object back (in Range requests of range_size bytes when set); returns (sha256, bytes, seconds)
+    digest = hashlib.sha256()
+    received = 0
+    start = time.perf_counter()
+    while True:
+        headers = {"Range": f"bytes={received}-{received + range_size - 1}"} if range_size else None
+        response, _ = http_client.request("GET", url, stream=True, headers=headers)
+        with response:
+            if response.status_code not in (200, 206):
+                raise RuntimeError(f"Download returned {response.status_code}")
+            before = received
+            for chunk in response.iter_content(READ_CHUNK):
+                digest.update(chunk)
+                received += len(chunk)
+            total_size = None
+            if response.status_code == 206:
+                total_size = int(response.headers.get("Content-Range", "*/0").rsplit("/", 1)[1])
+                if received == before and received < total_size:
+                    # Asking for the same range again would get the same empty answer forever
+                    raise RuntimeError(f"Range request at byte {received} of {total_size} returned no data")
+        # A 200 means the server ignored Range and sent everything
+        if response.status_code == 200 or received >= total_size:
+            break
+    elapsed = time.perf_counter() - start
+    name = urlsplit(url).path.rsplit("/", 1)[-1]
+    log_performance(f"/files/{name}", "GET", {"range": range_size} if range_size else None, response,
+                    {"connect": 0.0, "ttfb": 0.0, "server": 0.0, "total": elapsed}, size=received)
+    return digest.hexdigest(), received, elapsed
+
+def run_bucket(directory, size, repeats, range_size, keep):
+    path, checksum = generate_file(directory, size)
+    bucket = {"size": size, "upload": [], "download": [], "upload_mbps": [], "download_mbps": [],
+              "checksum_failures": 0, "errors": []}
+    try:
+        for _ in range(repeats):
+            try:
+                name, url, up_time = upload(path)
+                bucket["upload"].append(up_time)
+                bucket["upload_mbps"].append(size / up_time / UNITS["MB"])
+                got, received, down_time = download(url, range_size)
+                bucket["download"].append(down_time)
+                bucket["download_mbps"].append(received / down_time / UNITS["MB"])
+                if got != checksum or received != size:
+                    bucket["checksum_failures"] += 1
+                    print(f"  {fmt_size(size)}: checksum mismatch for {name} ({received} of {size} bytes)")
+                if not keep:
+                    file_test.test_delete_file(name)
+            except Exception as e:
+                bucket["errors"].append(str(e))
+                print(f"  {fmt_size(size)}: Error: {e}")
+    finally:
+        os.remove(path)
+    return bucket
+
+def print_report(buckets):
+    print(f"\n{'Size':>7}{'N':>4}{'Up MB/s':>10}{'Up p50':>11}{'Up p95':>11}"
+          f"{'Down MB/s':>11}{'Down p50':>11}{'Down p95':>11}{'Bad':>5}{'Err':>5}")
+    for b in buckets:
+        up, down = summarize(b["upload"]), summarize(b["download"])
+        up_rate = summarize(b["upload_mbps"])["p50"]
+        down_rate = summarize(b["download_mbps"])["p50"]
+        print(f"{fmt_size(b['size']):>7}{up['count']:>4}{up_rate if up_rate is not None else 0:>10.2f}"
+              f"{fmt_seconds(up['p50']):>11}{fmt_seconds(up['p95']):>11}"
+              f"{down_rate if down_rate is not None else 0:>11.2f}{fmt_seconds(down['p50']):>11}"
+              f"{fmt_seconds(down['p95']):>11}{b['checksum_failures']:>5}{len(b['errors']):>5}")
+    print("MB/s columns are medians; Bad = checksum mismatches")
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming upload/download throughput of the file service by size")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--max-size", type=parse_size, help="Skip buckets larger than this, e.g. 50MB")
+    parser.add_argument("--repeats", type=int, default=3, help="Round trips per size bucket")
+    parser.add_argument("--range-size", type=parse_size, default=0,
+                        help="Download in Range requests of this size (default: one streamed GET)")
+    parser.add_argument("--keep", action="store_true", help="Do not delete the uploaded objects")
+    parser.add_argument("--dir", help="Where to generate files (default: a temp dir)")
+    parser.add_argument("--out", default=os.path.join("output", "file_throughput.json"))
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = file_test.BASE_URL = args.base_url
+    sizes = sorted(parse_size(s) for s in args.sizes.split(","))
+    if args.max_size:
+        sizes = [s for s in sizes if s <= args.max_size]
+    directory = args.dir or tempfile.mkdtemp(prefix="file_throughput_")
+    os.makedirs(directory, exist_ok=True)
+    buckets = []
+    try:
+        for size in sizes:
+            print(f"\n=== {fmt_size(size)} x {args.repeats} ===")
+            buckets.append(run_bucket(directory, size, args.repeats, args.range_size, args.keep))
+    finally:
+        if not args.dir:
+            shutil.rmtree(directory, ignore_errors=True)
+    print_report(buckets)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(buckets, f, indent=4)
+    print(f"\nResults saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
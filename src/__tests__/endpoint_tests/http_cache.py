@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import http_client
+
+# Optional client-side HTTP cache for GETs: an LRU bounded by entry count and bytes. Entries younger
+# than the TTL are served locally; older ones are revalidated with If-None-Match / If-Modified-Since
+# when the backend sent an ETag or Last-Modified. Off unless HTTP_CACHE=1. test.send_request clears it
+# after every write.
+ENABLED = os.environ.get("HTTP_CACHE") == "1"
+TTL = float(os.environ.get("HTTP_CACHE_TTL", "0"))
+MAX_ENTRIES = int(os.environ.get("HTTP_CACHE_MAX_ENTRIES", "256"))
+MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+_entries = OrderedDict()
+_bytes = 0
+_generation = 0  # Bumped by clear(), so a GET that was in flight during a write is not stored
+_stats = {}
+_lock = threading.Lock()
+
+def configure(enabled=None, ttl=None, max_entries=None, max_bytes=None):
+    global ENABLED, TTL, MAX_ENTRIES, MAX_BYTES
+    if enabled is not None:
+        ENABLED = enabled
+    if ttl is not None:
+        TTL = ttl
+    if max_entries is not None:
+        MAX_ENTRIES = max_entries
+    if max_bytes is not None:
+        MAX_BYTES = max_bytes
+    clear()
+
+def _key(method, path, params):
+    return (method, path, json.dumps(params or {}, sort_keys=True, default=str))
+
+def _count(path, outcome, saved=0):
+    entry = _stats.setdefault(path, {"hit": 0, "revalidated": 0, "miss": 0, "bytes_saved": 0,
+                                     "validators": False})
+    entry[outcome] += 1
+    entry["bytes_saved"] += saved
+
+def _evict_locked():
+    global _bytes
+    while _entries and (len(_entries) > MAX_ENTRIES or _bytes > MAX_BYTES):
+        _, (response, _) = _entries.popitem(last=False)
+        _bytes -= len(response.content)
+
+def _store_locked(key, response):
+    global _bytes
+    _drop_locked(key)
+    _entries[key] = (response, time.monotonic())
+    _bytes += len(response.content)
+    _evict_locked()
+
+def clear():
+    global _bytes, _generation
+    with _lock:
+        _entries.clear()
+        _bytes = 0
+        _generation += 1
+
+def _drop_locked(key):
+    global _bytes
+    entry = _entries.pop(key, None)
+    if entry:
+        _bytes -= len(entry[0].content)
+
+def request(url, path, params=None, headers=None):
+    # Drop-in for http_client.request on non-streamed GETs; returns (response, timing)
+    key = _key("GET", path, params)
+    start = time.perf_counter()
+    with _lock:
+        generation = _generation
+        cached = _entries.get(key)
+        if cached:
+            _entries.move_to_end(key)
+    if cached:
+        response, stored_at = cached
+        if time.monotonic() - stored_at < TTL:
+            with _lock:
+                _count(path, "hit", len(response.content))
+            elapsed = time.perf_counter() - start
+            return response, {"connect": 0.0, "ttfb": 0.0, "server": 0.0, "total": elapsed}
+        conditional = dict(headers or {})
+        if response.headers.get("ETag"):
+            conditional["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            conditional["If-Modified-Since"] = response.headers["Last-Modified"]
+        fresh, timing = http_client.request("GET", url, params=params, headers=conditional)
+        if fresh.status_code == 304:
+            with _lock:
+                if generation == _generation:
+                    _store_locked(key, response)
+                _count(path, "revalidated", len(response.content))
+            return response, timing
+    else:
+        fresh, timing = http_client.request("GET", url, params=params, headers=headers)
+
+    has_validators = bool(fresh.headers.get("ETag") or fresh.headers.get("Last-Modified"))
+    with _lock:
+        _count(path, "miss")
+        _stats[path]["validators"] = _stats[path]["validators"] or has_validators
+        if fresh.status_code == 200 and (has_validators or TTL > 0) and generation == _generation:
+            _store_locked(key, fresh)
+        else:
+            _drop_locked(key)
+    return fresh, timing
+
+def stats():
+    with _lock:
+        return {path: dict(entry) for path, entry in _stats.items()}
+
+def print_stats():
+    rows = stats()
+    if not rows:
+        return
+    print(f"\n{'Endpoint':<26}{'Hit':>6}{'304':>6}{'Miss':>6}{'Saved':>12}  Validators")
+    for path, entry in rows.items():
+        print(f"{path:<26}{entry['hit']:>6}{entry['revalidated']:>6}{entry['miss']:>6}"
+              f"{entry['bytes_saved'] / 1024:>10.1f}KB  {'yes' if entry['validators'] else 'no'}")
+    print(f"Client cache: {len(_entries)} entries, {_bytes / 1024:.1f}KB (TTL {TTL}s)")
@@ -0,0 +1,232 @@
+import os
+import socket
+import threading
+import time
+import uuid
+import zlib
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+# Shared connection-pool settings for every harness request
+POOL_SIZE = 20
+KEEP_ALIVE = True
+RETRIES = 0  # Retries hide backend failures in benchmarks, so off unless asked for
+BACKOFF = 0.2
+TIMEOUT = (5, 600)  # (connect, read) seconds - /getAllStudents has taken 300s
+
+READ_CHUNK = 64 * 1024
+
+# Instrumentation hooks, called on the requesting thread for every request through request() (and from
+# the event loop for async_client.AsyncClient.request, whose timing has no dns/download/decode):
+#   before(info)                    info = {"method", "url", "stream", "start"}; the same dict is passed on
+#   after(info, response, timing)   timing holds the phase split below
+#   error(info, exception)          the request raised (connection refused, timeout, ...)
+HOOK_EVENTS = ("before", "after", "error")
+_hooks = {event: [] for event in HOOK_EVENTS}
+
+_timing = threading.local()
+_session = None
+_session_lock = threading.Lock()
+
+def add_hook(event, fn):
+    if event not in _hooks:
+        raise ValueError(f"Unknown hook event: {event} (expected one of {', '.join(HOOK_EVENTS)})")
+    _hooks[event].append(fn)
+
+def remove_hook(event, fn):
+    if fn in _hooks.get(event, ()):
+        _hooks[event].remove(fn)
+
+def fire_hooks(event, *args):
+    for fn in list(_hooks[event]):
+        fn(*args)
+
+def _add_time(phase, elapsed):
+    setattr(_timing, phase, getattr(_timing, phase, 0.0) + elapsed)
+
+class TimedConnectionMixin:
+    # Resolves the host itself so DNS time is split from the TCP/TLS handshake, then connects to each
+    # resolved address in turn the way urllib3's create_connection would
+    def _new_conn(self):
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in
+                                           socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)))
+        except socket.gaierror:
+            addresses = [host]  # urllib3 raises its own NameResolutionError
+        _add_time("dns", time.perf_counter() - start)
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except NewConnectionError:
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _add_time("connect", time.perf_counter() - start)
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedAdapter(HTTPAdapter):
+    # Pooled adapter whose connections report how long the TCP/TLS setup took
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+def _build_session():
+    session = requests.Session()
+    retry = Retry(
+        total=RETRIES,
+        backoff_factor=BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+        raise_on_status=False,
+    )
+    adapter = TimedAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+    return session
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
+
+def configure(pool_size=None, keep_alive=None, retries=None, backoff=None, timeout=None):
+    global POOL_SIZE, KEEP_ALIVE, RETRIES, BACKOFF, TIMEOUT, _session
+    with _session_lock:
+        if pool_size is not None: POOL_SIZE = pool_size
+        if keep_alive is not None: KEEP_ALIVE = keep_alive
+        if retries is not None: RETRIES = retries
+        if backoff is not None: BACKOFF = backoff
+        if timeout is not None: TIMEOUT = timeout
+        if _session is not None:
+            _session.close()
+        _session = None
+
+def _inflate(data):
+    # wbits=47 auto-detects gzip or zlib headers; some servers send raw deflate instead
+    try:
+        return zlib.decompress(data, 47)
+    except zlib.error:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+
+# Content-Encodings whose decompression is timed separately from the download
+DECODERS = {"identity": lambda data: data, "gzip": _inflate, "deflate": _inflate}
+
+def _read_body(response):
+    # Reads a non-streamed body the way requests would, split into (download, decode) seconds
+    encoding = response.headers.get("Content-Encoding", "identity").lower()
+    decoder = DECODERS.get(encoding)
+    start = time.perf_counter()
+    wire = b"".join(response.raw.stream(READ_CHUNK, decode_content=decoder is None))
+    download = time.perf_counter() - start
+    start = time.perf_counter()
+    response._content = decoder(wire) if decoder else wire
+    response._content_consumed = True
+    return download, time.perf_counter() - start
+
+def request(method, url, **kwargs):
+    # Returns (response, timing). Phases come from the monotonic perf_counter clock: dns and connect
+    # (only when a new connection was opened), ttfb (request sent to headers parsed, including dns and
+    # connect), server (ttfb less the client-side setup), download and decode (Content-Encoding
+    # decompression; both 0 for stream=True, where the caller reads the body) and total
+    kwargs.setdefault("timeout", TIMEOUT)
+    stream = kwargs.pop("stream", False)
+    session = get_session()
+    info = {"method": method, "url": url, "stream": stream, "start": time.perf_counter()}
+    fire_hooks("before", info)
+    _timing.dns = _timing.connect = 0.0
+    start = time.perf_counter()
+    try:
+        response = session.request(method, url, stream=True, **kwargs)
+        download = decode = 0.0
+        if not stream:
+            download, decode = _read_body(response)
+    except Exception as e:
+        fire_hooks("error", info, e)
+        raise
+    total = time.perf_counter() - start
+    dns = _timing.dns
+    connect = max(_timing.connect - dns, 0.0)
+    ttfb = response.elapsed.total_seconds()
+    timing = {
+        "dns": dns,
+        "connect": connect,
+        "ttfb": ttfb,
+        "server": max(ttfb - dns - connect, 0.0),
+        "download": download,
+        "decode": decode,
+        "total": total,
+    }
+    fire_hooks("after", info, response, timing)
+    return response, timing
+
+class MultipartStream:
+    # multipart/form-data body that reads each file in chunks as it is sent, with a known length
+    # so requests sets Content-Length instead of buffering the files or falling back to chunked encoding
+    CHUNK = 256 * 1024
+
+    def __init__(self, parts):
+        # parts: list of (field_name, filename, path, content_type)
+        self.boundary = uuid.uuid4().hex
+        self.parts = []
+        for field, filename, path, content_type in parts:
+            filename = filename.replace('"', "%22")
+            header = (
+                f"--{self.boundary}\r\n"
+                f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                f"Content-Type: {content_type}\r\n\r\n"
+            ).encode()
+            self.parts.append((header, path, os.path.getsize(path)))
+        self.trailer = f"--{self.boundary}--\r\n".encode()
+        self.bytes_sent = 0
+
+    @property
+    def content_type(self):
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self):
+        return sum(len(h) + size + 2 for h, _, size in self.parts) + len(self.trailer)
+
+    def __iter__(self):
+        for header, path, _ in self.parts:
+            yield header
+            with open(path, "rb") as f:
+                while True:
+                    chunk = f.read(self.CHUNK)
+                    if not chunk:
+                        break
+                    self.bytes_sent += len(chunk)
+                    yield chunk
+            yield b"\r\n"
+        yield self.trailer
@@ -0,0 +1,113 @@
+import codecs
+import gzip
+import json
+import os
+
+_decoder = json.JSONDecoder()
+WHITESPACE = " \t\r\n"
+
+class _Buffer:
+    # Text buffer fed from an iterator of byte chunks, decoded incrementally as UTF-8
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        # Drop consumed text so the buffer only ever holds the unparsed tail
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        for chunk in self.chunks:
+            if chunk:
+                self.text += self.utf8.decode(chunk)
+                return True
+        self.text += self.utf8.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut by a chunk boundary decodes short: "2500." as 2500, "1e" as 1. If the buffer
+            # ends there, or at a character that would continue it, read on and decode again.
+            if (not self.eof and isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                    and (end == len(self.text) or self.text[end] in ".eE+-")):
+                self.fill()
+                continue
+            self.pos = end
+            return obj
+
+def _iter_array(buf):
+    buf.expect("[")
+    if buf.peek() == "]":
+        buf.pos += 1
+        return
+    while True:
+        yield buf.value()
+        sep = buf.peek()
+        buf.pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or ']' got {sep!r}")
+
+def iter_records(chunks, key="content"):
+    # Yields elements of a top-level JSON array, or of `key` inside a top-level object (Spring Page),
+    # without holding the whole document in memory. Any other document (a single created record, an
+    # error body, a scalar) is yielded whole as one record; an empty body yields nothing.
+    buf = _Buffer(chunks)
+    start = buf.peek()
+    if start is None:
+        return
+    if start == "[":
+        yield from _iter_array(buf)
+        return
+    if start != "{":
+        yield buf.value()
+        return
+    buf.expect("{")
+    fields = {}
+    while buf.peek() != "}":
+        name = buf.value()
+        buf.expect(":")
+        if name == key and buf.peek() == "[":
+            yield from _iter_array(buf)
+            return
+        fields[name] = buf.value()
+        if buf.peek() == ",":
+            buf.pos += 1
+    yield fields
+
+def open_output(filepath, mode="wb"):
+    return gzip.open(filepath, mode) if filepath.endswith(".gz") else open(filepath, mode)
+
+def load_output(filepath):
+    # Loads any saved snapshot (.json, .ndjson, optionally .gz) back into Python for diffing
+    with open_output(filepath, "rt") as f:
+        if ".ndjson" in os.path.basename(filepath):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
@@ -0,0 +1,205 @@
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import http_client
+from stats import Histogram
+
+# Live counters and per-phase latency histograms fed by the http_client hooks, served in Prometheus
+# text format on a local port and/or printed as a one-line summary every few seconds
+PHASES = ("dns", "connect", "ttfb", "download", "decode", "total")
+# Prometheus bucket bounds (seconds); /getAllStudents has taken minutes, hence the long tail
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+PREFIX = "harness"
+
+def route_of(url):
+    # Collapses IDs and generated file names (/exams/12, /files/1712_0_logo.png) so label sets stay small
+    return re.sub(r"/[^/]*\d[^/]*", "/{id}", urlsplit(url).path) or "/"
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+class LiveMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.in_flight = 0
+        self.requests = {}  # (method, route, status) -> count
+        self.errors = {}    # (method, route, exception name) -> count
+        self.bytes = {}     # (method, route) -> response bytes
+        self.phases = {}    # (method, route, phase) -> Histogram
+        self._reset_window()
+
+    def _reset_window(self):
+        # The terminal summary reports the last interval, so a degrading backend shows up as it happens
+        self.window_start = time.perf_counter()
+        self.window_count = 0
+        self.window_errors = 0
+        self.window = {phase: Histogram() for phase in PHASES}
+
+    def before(self, info):
+        with self.lock:
+            self.in_flight += 1
+
+    def after(self, info, response, timing):
+        method, route = info["method"], route_of(info["url"])
+        with self.lock:
+            self.in_flight -= 1
+            key = (method, route, response.status_code)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            if not info["stream"]:
+                self.bytes[method, route] = self.bytes.get((method, route), 0) + len(response.content)
+            self.window_count += 1
+            if response.status_code >= 400:
+                self.window_errors += 1
+            for phase in PHASES:
+                value = timing.get(phase)
+                if value is None:
+                    continue
+                self.phases.setdefault((method, route, phase), Histogram()).record(value)
+                self.window[phase].record(value)
+
+    def error(self, info, exc):
+        key = (info["method"], route_of(info["url"]), type(exc).__name__)
+        with self.lock:
+            self.in_flight -= 1
+            self.errors[key] = self.errors.get(key, 0) + 1
+            self.window_count += 1
+            self.window_errors += 1
+
+    def install(self):
+        for event in http_client.HOOK_EVENTS:
+            http_client.add_hook(event, getattr(self, event))
+        return self
+
+    def uninstall(self):
+        for event in http_client.HOOK_EVENTS:
+            http_client.remove_hook(event, getattr(self, event))
+
+    def prometheus(self):
+        with self.lock:
+            lines = [
+                f"# HELP {PREFIX}_requests_in_flight Requests sent and not yet answered",
+                f"# TYPE {PREFIX}_requests_in_flight gauge",
+                f"{PREFIX}_requests_in_flight {self.in_flight}",
+                f"# HELP {PREFIX}_uptime_seconds Seconds since the exporter started",
+                f"# TYPE {PREFIX}_uptime_seconds gauge",
+                f"{PREFIX}_uptime_seconds {time.perf_counter() - self.started:.3f}",
+                f"# HELP {PREFIX}_requests_total Responses received, by status",
+                f"# TYPE {PREFIX}_requests_total counter",
+            ]
+            for (method, route, status), n in sorted(self.requests.items()):
+                lines.append(f"{PREFIX}_requests_total{_labels(method=method, route=route, status=status)} {n}")
+            lines += [f"# HELP {PREFIX}_request_errors_total Requests that raised before a response arrived",
+                      f"# TYPE {PREFIX}_request_errors_total counter"]
+            for (method, route, error), n in sorted(self.errors.items()):
+                lines.append(f"{PREFIX}_request_errors_total{_labels(method=method, route=route, error=error)} {n}")
+            lines += [f"# HELP {PREFIX}_response_bytes_total Response body bytes read by the client",
+                      f"# TYPE {PREFIX}_response_bytes_total counter"]
+            for (method, route), n in sorted(self.bytes.items()):
+                lines.append(f"{PREFIX}_response_bytes_total{_labels(method=method, route=route)} {n}")
+            lines += [f"# HELP {PREFIX}_request_phase_seconds Request time by phase ({', '.join(PHASES)})",
+                      f"# TYPE {PREFIX}_request_phase_seconds histogram"]
+            for (method, route, phase), hist in sorted(self.phases.items()):
+                labels = {"method": method, "route": route, "phase": phase}
+                for bound in BUCKETS:
+                    lines.append(f"{PREFIX}_request_phase_seconds_bucket{_labels(**labels, le=bound)} "
+                                 f"{hist.count_at_most(bound)}")
+                lines.append(f"{PREFIX}_request_phase_seconds_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+                lines.append(f"{PREFIX}_request_phase_seconds_sum{_labels(**labels)} {hist.sum:.6f}")
+                lines.append(f"{PREFIX}_request_phase_seconds_count{_labels(**labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def tick(self):
+        # One summary line for the interval since the last tick, then starts a new interval
+        with self.lock:
+            now = time.perf_counter()
+            interval = max(now - self.window_start, 1e-9)
+            total = self.window["total"]
+            phases = "  ".join(f"{phase} {_ms(self.window[phase].percentile(99))}" for phase in PHASES[:-1])
+            line = (f"[{now - self.started:>7.1f}s] {self.window_count / interval:>8.1f} req/s  "
+                    f"in flight {self.in_flight:>4}  err {self.window_errors:>4}  "
+                    f"p50 {_ms(total.percentile(50))}  p99 {_ms(total.percentile(99))}  "
+                    f"max {_ms(total.max)}  | p99 {phases}")
+            self._reset_window()
+        return line
+
+def _ms(value):
+    return "-" if value is None else f"{value * 1000:.1f}ms"
+
+class _Handler(BaseHTTPRequestHandler):
+    metrics = None
+
+    def do_GET(self):
+        if urlsplit(self.path).path not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.metrics.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(metrics, port, host="127.0.0.1"):
+    handler = type("MetricsHandler", (_Handler,), {"metrics": metrics})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def print_live(metrics, interval, stop, prefix=""):
+    def loop():
+        while not stop.wait(interval):
+            print(prefix + metrics.tick(), flush=True)
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    return thread
+
+class Exporter:
+    # Hooks a LiveMetrics into http_client and starts the Prometheus endpoint and/or terminal summary;
+    # use as a context manager around a run. label prefixes the printed lines (e.g. "Process 2").
+    def __init__(self, port=None, interval=None, host="127.0.0.1", label=None):
+        self.port, self.interval, self.host = port, interval, host
+        self.prefix = f"{label}: " if label else ""
+        self.metrics = LiveMetrics()
+        self.server = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        if self.port is None and not self.interval:
+            return self  # Nothing asked for: stay out of the request path
+        self.metrics.install()
+        if self.port is not None:
+            try:
+                self.server = serve(self.metrics, self.port, self.host)
+            except OSError as e:
+                # A port in use should not cost the run its metrics; any free port still works
+                self.server = serve(self.metrics, 0, self.host)
+                print(f"{self.prefix}Port {self.port} unavailable ({e.strerror}), "
+                      f"using {self.server.server_address[1]} instead")
+            print(f"{self.prefix}Metrics at http://{self.host}:{self.server.server_address[1]}/metrics")
+        if self.interval:
+            print_live(self.metrics, self.interval, self.stop_event, self.prefix)
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        self.metrics.uninstall()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,369 @@
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+
+import http_client
+import live_metrics
+import perf_log
+import test
+from test import LIST_ENDPOINTS, list_params, send_request, log_performance
+from stats import Histogram, fmt_seconds
+
+START_TIMEOUT = 60
+
+class LoadError(Exception):
+    pass
+
+HISTOGRAM_KEYS = ("histogram", "service")
+
+class RatePacer:
+    # Hands out evenly spaced send slots shared by all workers
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_slot = time.time()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            slot = max(self.next_slot, time.time())
+            self.next_slot = slot + self.interval
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+def run_load(endpoints=None, workers=8, rate=0, duration=30, stop=None, quiet=False):
+    endpoints = endpoints or LIST_ENDPOINTS
+    pacer = RatePacer(rate)
+    picker = itertools.cycle(endpoints)
+    pick_lock = threading.Lock()
+    results = {path: {"histogram": Histogram(), "errors": 0, "statuses": {}} for _, path in endpoints}
+    results_lock = threading.Lock()
+    deadline = time.time() + duration
+
+    def worker():
+        while True:
+            pacer.wait()
+            if time.time() >= deadline or (stop is not None and stop.is_set()):
+                return
+            with pick_lock:
+                method, path = next(picker)
+            try:
+                params = list_params(path)
+                response, timing = send_request(method, path, params=params)
+                elapsed, status = timing["total"], response.status_code
+                log_performance(path, method, params, response, timing)
+            except Exception:
+                elapsed, status = None, "error"
+            with results_lock:
+                entry = results[path]
+                entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+                if status == "error" or status >= 400:
+                    entry["errors"] += 1
+                if elapsed is not None:
+                    entry["histogram"].record(elapsed)
+
+    if not quiet:
+        print(f"\n--- Load: {workers} workers, rate {rate or 'unlimited'} req/s, {duration}s ---")
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in range(workers):
+            pool.submit(worker)
+    elapsed_total = time.time() - started
+    return results, elapsed_total
+
+def run_open_loop(endpoints=None, rate=50, duration=30, max_in_flight=256, stop=None, quiet=False):
+    # Open loop: request i is due at start + i / rate whatever the earlier ones are doing. Latency is
+    # measured from that intended send time, so time spent queued behind a stalled server is counted
+    # (coordinated-omission correction); "service" keeps the uncorrected per-request time for comparison
+    if not rate:
+        raise ValueError("Open-loop mode needs a target --rate")
+    endpoints = endpoints or LIST_ENDPOINTS
+    picker = itertools.cycle(endpoints)
+    results = {path: {"histogram": Histogram(), "service": Histogram(), "errors": 0, "statuses": {},
+                      "late": 0} for _, path in endpoints}
+    results_lock = threading.Lock()
+    interval = 1.0 / rate
+
+    def fire(method, path, intended):
+        sent = time.perf_counter()
+        try:
+            params = list_params(path)
+            response, timing = send_request(method, path, params=params)
+            status, service = response.status_code, timing["total"]
+            log_performance(path, method, params, response, timing)
+        except Exception:
+            status, service = "error", None
+        done = time.perf_counter()
+        with results_lock:
+            entry = results[path]
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            if status == "error" or status >= 400:
+                entry["errors"] += 1
+            if sent - intended > interval:
+                entry["late"] += 1
+            entry["histogram"].record(done - intended)
+            if service is not None:
+                entry["service"].record(service)
+
+    if not quiet:
+        print(f"\n--- Open-loop load: {rate} req/s, up to {max_in_flight} in flight, {duration}s ---")
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        start = time.perf_counter()
+        for i in itertools.count():
+            intended = start + i * interval
+            if intended - start >= duration or (stop is not None and stop.is_set()):
+                break
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            method, path = next(picker)
+            pool.submit(fire, method, path, intended)
+    elapsed_total = time.time() - started
+    return results, elapsed_total
+
+def shard_endpoints(endpoints, processes, mode):
+    # "endpoints": each process owns a disjoint slice; "users": every process runs the full mix
+    if mode == "endpoints":
+        return [endpoints[i::processes] for i in range(min(processes, len(endpoints)))]
+    return [endpoints] * processes
+
+def _process_main(index, shard, workers, rate, duration, base_url, keep_alive, open_loop, ready, start, stop,
+                  queue, metrics_port=None):
+    # Ctrl-C is handled by the parent, which sets the shared stop event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    test.BASE_URL = base_url
+    http_client.configure(pool_size=workers, keep_alive=keep_alive)
+    exporter = None
+    try:
+        if metrics_port is not None:
+            # One scrape target per process; Prometheus sums them
+            exporter = live_metrics.Exporter(metrics_port + index, label=f"Process {index}").start()
+        ready.wait(START_TIMEOUT)
+        if not start.wait(START_TIMEOUT):
+            # The parent gave up on the start; running the load now would hit the backend unsupervised
+            raise LoadError(f"no start signal within {START_TIMEOUT}s")
+        if open_loop:
+            results, elapsed = run_open_loop(shard, rate, duration, workers, stop=stop, quiet=True)
+        else:
+            results, elapsed = run_load(shard, workers, rate, duration, stop=stop, quiet=True)
+        for entry in results.values():
+            for key in HISTOGRAM_KEYS:
+                if key in entry:
+                    entry[key] = entry[key].to_dict()
+        queue.put((index, results, elapsed))
+    except Exception as e:
+        if not start.is_set():
+            ready.abort()  # Wake the parent and the other children now rather than after START_TIMEOUT
+        queue.put((index, e, 0))
+    finally:
+        if exporter is not None:
+            exporter.stop()
+        perf_log.flush()
+
+def _wait_ready(ready, procs):
+    # Waits at the start barrier on a helper thread while watching the children: one that exits first
+    # (an exception, a crash, a kill) breaks the barrier at once. Returns False if the barrier broke.
+    broken = []
+
+    def wait():
+        try:
+            ready.wait(START_TIMEOUT)
+        except threading.BrokenBarrierError:
+            broken.append(True)
+
+    waiter = threading.Thread(target=wait, daemon=True)
+    waiter.start()
+    while waiter.is_alive():
+        if any(proc.exitcode is not None for proc in procs):
+            ready.abort()
+        waiter.join(0.2)
+    return not broken
+
+def _exit_failures(procs, reported):
+    # Children that died without reporting back, e.g. killed or crashed in the interpreter
+    return [f"process {i} exited with code {proc.exitcode}" for i, proc in enumerate(procs)
+            if i not in reported and proc.exitcode not in (None, 0)]
+
+def _start_failures(queue, procs):
+    # Collects why the start failed once every child has exited; a child that only saw the barrier
+    # break because of another one is not the cause
+    failures, reported = [], set()
+    deadline = time.time() + START_TIMEOUT
+    while len(reported) < len(procs) and time.time() < deadline:
+        try:
+            index, error, _ = queue.get(timeout=0.2)
+        except Empty:
+            if all(proc.exitcode is not None for proc in procs):
+                break
+            continue
+        reported.add(index)
+        if not isinstance(error, threading.BrokenBarrierError):
+            failures.append(f"process {index}: {type(error).__name__}: {error}")
+    for proc in procs:
+        proc.join(1)
+        if proc.is_alive():
+            proc.terminate()
+            proc.join()
+    return failures + _exit_failures(procs, reported)
+
+def run_multiprocess(endpoints=None, processes=None, workers=8, rate=0, duration=30, shard="endpoints",
+                     keep_alive=True, open_loop=False, metrics_port=None):
+    # Every process connects and waits at a barrier, the parent releases them together, and a shared
+    # stop event ends the run early on Ctrl-C; per-process histograms are merged into one report.
+    # Raises LoadError if any process fails before the start; returns the failures of any that fail later.
+    endpoints = endpoints or LIST_ENDPOINTS
+    shards = shard_endpoints(endpoints, processes or os.cpu_count() or 1, shard)
+    n = len(shards)
+    per_process_workers = max(1, math.ceil(workers / n))
+    ctx = multiprocessing.get_context()
+    ready = ctx.Barrier(n + 1)
+    start, stop = ctx.Event(), ctx.Event()
+    queue = ctx.Queue()
+    # Children share the parent's run ID so the perf log groups them as one run
+    os.environ["PERF_RUN_ID"] = perf_log.RUN_ID
+    procs = [
+        ctx.Process(target=_process_main, args=(i, shard_, per_process_workers, rate / n, duration,
+                                                test.BASE_URL, keep_alive, open_loop, ready, start, stop,
+                                                queue, metrics_port))
+        for i, shard_ in enumerate(shards)
+    ]
+    for proc in procs:
+        proc.start()
+
+    print(f"\n--- Load: {n} processes x {per_process_workers} workers ({shard} sharding), "
+          f"rate {rate or 'unlimited'} req/s, {duration}s ---")
+    if not _wait_ready(ready, procs):
+        stop.set()
+        failures = _start_failures(queue, procs)
+        raise LoadError("; ".join(failures) or f"not every process was ready within {START_TIMEOUT}s")
+    start.set()
+    started = time.time()
+    merged, reported, failures = {}, set(), []
+    while len(reported) < n:
+        try:
+            index, results, _ = queue.get(timeout=1)
+        except Empty:
+            lost = _exit_failures(procs, reported)
+            for i, proc in enumerate(procs):
+                if proc.exitcode not in (None, 0):
+                    reported.add(i)
+            for failure in lost:
+                print(f"Worker {failure}")
+            failures += lost
+            continue
+        except KeyboardInterrupt:
+            # Workers finish their in-flight requests and still report what they measured
+            print("Stopping workers...")
+            stop.set()
+            continue
+        reported.add(index)
+        if isinstance(results, Exception):
+            failures.append(f"process {index}: {type(results).__name__}: {results}")
+            print(f"Worker {failures[-1]}")
+            continue
+        for path, entry in results.items():
+            target = merged.setdefault(path, {"errors": 0, "statuses": {}})
+            for key in HISTOGRAM_KEYS:
+                if key in entry:
+                    target.setdefault(key, Histogram()).merge(Histogram.from_dict(entry[key]))
+            target["errors"] += entry["errors"]
+            if "late" in entry:
+                target["late"] = target.get("late", 0) + entry["late"]
+            for status, count in entry["statuses"].items():
+                target["statuses"][status] = target["statuses"].get(status, 0) + count
+    elapsed_total = time.time() - started
+    for proc in procs:
+        proc.join()
+    return merged, elapsed_total, failures
+
+def print_report(results, elapsed_total):
+    print(f"\n{'Endpoint':<26}{'Reqs':>7}{'Err':>6}{'Req/s':>9}{'p50':>11}{'p95':>11}{'p99':>11}")
+    total = 0
+    for path, entry in results.items():
+        summary = entry["histogram"].summary()
+        count = sum(entry["statuses"].values())
+        total += count
+        print(f"{path:<26}{count:>7}{entry['errors']:>6}{count / elapsed_total:>9.2f}"
+              f"{fmt_seconds(summary['p50']):>11}{fmt_seconds(summary['p95']):>11}{fmt_seconds(summary['p99']):>11}")
+    print(f"\nTotal: {total} requests in {elapsed_total:.2f}s ({total / elapsed_total:.2f} req/s)")
+
+def print_open_loop_report(results, elapsed_total):
+    # Latency columns are from the intended send time; "Svc p99" is the uncorrected request time
+    print(f"\n{'Endpoint':<26}{'Reqs':>7}{'Err':>6}{'Late':>6}{'p50':>11}{'p99':>11}{'p99.9':>11}"
+          f"{'max':>11}{'Svc p99':>11}")
+    total = late = 0
+    for path, entry in results.items():
+        hist = entry["histogram"]
+        count = sum(entry["statuses"].values())
+        total += count
+        late += entry["late"]
+        print(f"{path:<26}{count:>7}{entry['errors']:>6}{entry['late']:>6}{fmt_seconds(hist.percentile(50)):>11}"
+              f"{fmt_seconds(hist.percentile(99)):>11}{fmt_seconds(hist.percentile(99.9)):>11}"
+              f"{fmt_seconds(hist.max):>11}{fmt_seconds(entry['service'].percentile(99)):>11}")
+    print(f"\nTotal: {total} requests in {elapsed_total:.2f}s ({total / elapsed_total:.2f} req/s)")
+    if late:
+        print(f"{late} requests were sent late: the server or the in-flight cap could not keep up with the rate")
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load run over the list endpoints")
+    parser.add_argument("--workers", type=int, default=8, help="Total worker threads (split across processes)")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes (0 = one per CPU core)")
+    parser.add_argument("--shard", choices=("endpoints", "users"), default="endpoints",
+                        help="Split the endpoint list across processes, or run the full mix in each")
+    parser.add_argument("--rate", type=float, default=0, help="Target total requests/s (0 = as fast as possible)")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--endpoint", action="append", help="Limit to these paths (repeatable)")
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    parser.add_argument("--no-keep-alive", action="store_true", help="Open a new connection per request")
+    parser.add_argument("--open-loop", action="store_true",
+                        help="Send at a constant --rate regardless of response times (--workers caps requests in flight)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="Serve live Prometheus metrics on this local port (process i of --processes uses port + i, "
+                             "or a free port it prints if that one is taken)")
+    parser.add_argument("--live", type=float, metavar="SECONDS",
+                        help="Print a live throughput/latency line every SECONDS (single process only)")
+    args = parser.parse_args()
+    if args.open_loop and not args.rate:
+        parser.error("--open-loop needs a target --rate")
+
+    test.BASE_URL = args.base_url
+    endpoints = [e for e in LIST_ENDPOINTS if not args.endpoint or e[1] in args.endpoint]
+    if args.processes != 1:
+        if args.live:
+            parser.error("--live needs --processes 1; scrape --metrics-port instead")
+        try:
+            results, elapsed_total, failures = run_multiprocess(
+                endpoints, args.processes or None, args.workers, args.rate, args.duration, args.shard,
+                not args.no_keep_alive, args.open_loop, args.metrics_port)
+        except LoadError as e:
+            print(f"Load run did not start: {e}")
+            sys.exit(1)
+    else:
+        failures = []
+        http_client.configure(pool_size=args.workers, keep_alive=not args.no_keep_alive)
+        with live_metrics.Exporter(args.metrics_port, args.live):
+            if args.open_loop:
+                results, elapsed_total = run_open_loop(endpoints, args.rate, args.duration, args.workers)
+            else:
+                results, elapsed_total = run_load(endpoints, args.workers, args.rate, args.duration)
+    if args.open_loop:
+        print_open_loop_report(results, elapsed_total)
+    else:
+        print_report(results, elapsed_total)
+    if failures:
+        print(f"{len(failures)} worker process(es) failed; the report covers the others only")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import argparse
+import copy
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from email.parser import BytesParser
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+FIXTURES_DIR = os.path.join(REPO_ROOT, "output_json")
+
+# collection -> (id field, fixture recorded from the real backend)
+COLLECTIONS = {
+    "students": ("studentId", "GET_getAllStudents.json"),
+    "exams": ("examNo", "GET_getAllExams.json"),
+    "regions": ("regionId", "GET_getRegions.json"),
+    "centres": ("centreId", "GET_getAllExamCentres.json"),
+    "schools": ("schoolId", "GET_getAllSchools.json"),
+    "applications": ("applicationId", "GET_getAllApplications.json"),
+    "results": ("id", "GET_getAllResults.json"),
+    "profiles": ("profileId", None),
+}
+
+# Cold = cache miss, warm = cache hit, in seconds; taken from performance.txt
+LATENCY_PROFILES = {
+    "none": {"default": {"cold": 0, "warm": 0}},
+    "realistic": {
+        "default": {"cold": 1.3, "warm": 0.025},
+        "/getAllStudents": {"cold": 1.6, "warm": 0.05},
+        "/students": {"cold": 1.5, "warm": 0.02},
+        "/getRegions": {"cold": 1.0, "warm": 1.0},
+        "/regions": {"cold": 1.0, "warm": 0.02},
+        "/getAllApplications": {"cold": 6.7, "warm": 0.027},
+        "/exam-applications": {"cold": 4.8, "warm": 0.026},
+        "/getAllResults": {"cold": 6.3, "warm": 0.06},
+        "/exam-results": {"cold": 4.1, "warm": 0.035},
+        "POST": {"cold": 0.2, "warm": 0.2},
+    },
+}
+
+class Store:
+    def __init__(self, fixtures_dir=FIXTURES_DIR, synthetic=0):
+        self.lock = threading.Lock()
+        self.data = {}
+        self.next_id = {}
+        for name, (id_field, fixture) in COLLECTIONS.items():
+            records = []
+            path = os.path.join(fixtures_dir, fixture) if fixture else None
+            if path and os.path.exists(path):
+                with open(path) as f:
+                    records = json.load(f)
+            records = self._expand(records, id_field, synthetic)
+            self.data[name] = {r[id_field]: r for r in records}
+            self.next_id[name] = max(self.data[name], default=0) + 1
+        self.files = {}
+
+    @staticmethod
+    def _expand(records, id_field, synthetic):
+        # Clones fixture records with fresh IDs to fake a larger dataset
+        if not records or synthetic <= len(records):
+            return records
+        expanded = list(records)
+        next_id = max(r[id_field] for r in records) + 1
+        for i in range(len(records), synthetic):
+            clone = copy.deepcopy(records[i % len(records)])
+            clone[id_field] = next_id
+            next_id += 1
+            expanded.append(clone)
+        return expanded
+
+    def list(self, name):
+        with self.lock:
+            return list(self.data[name].values())
+
+    def get(self, name, record_id):
+        with self.lock:
+            return self.data[name].get(record_id)
+
+    def create(self, name, record):
+        id_field = COLLECTIONS[name][0]
+        with self.lock:
+            record[id_field] = self.next_id[name]
+            self.next_id[name] += 1
+            self.data[name][record[id_field]] = record
+        return record
+
+    def update(self, name, record_id, changes):
+        with self.lock:
+            if record_id not in self.data[name]:
+                return None
+            self.data[name][record_id].update(changes)
+            return self.data[name][record_id]
+
+    def delete(self, name, record_id):
+        with self.lock:
+            return self.data[name].pop(record_id, None) is not None
+
+    def add_files(self, files):
+        # All or nothing: returns the first name that already exists, or None once every file is stored
+        with self.lock:
+            for name in files:
+                if name in self.files:
+                    return name
+            self.files.update(files)
+        return None
+
+    def get_file(self, name):
+        with self.lock:
+            return self.files.get(name)
+
+    def delete_file(self, name):
+        with self.lock:
+            return self.files.pop(name, None) is not None
+
+class CacheModel:
+    # Emulates the backend's Redis cache: first read of a key is cold, later reads warm until a write
+    def __init__(self, profile, scale=1.0):
+        self.profile = profile
+        self.scale = scale
+        self.warm = set()
+        self.lock = threading.Lock()
+
+    def latency(self, method, path, key, collection, rows=0):
+        if method != "GET":
+            with self.lock:
+                self.warm = {k for k in self.warm if k[0] != collection}
+            entry = self.profile.get(method, self.profile["default"])
+            return entry["cold"] * self.scale, "MISS"
+        entry = self.profile.get(path, self.profile["default"])
+        with self.lock:
+            hit = (collection, key) in self.warm
+            self.warm.add((collection, key))
+        if hit:
+            return entry["warm"] * self.scale, "HIT"
+        return (entry["cold"] + entry.get("per_row", 0) * rows) * self.scale, "MISS"
+
+def paginate(records, query, id_field):
+    page = int(query.get("page", 0))
+    size = int(query.get("size", 20))
+    for key, value in query.items():
+        if key in ("page", "size", "sort") or not value:
+            continue
+        records = [r for r in records if value.lower() in str(r.get(key, "")).lower()]
+    sort = query.get("sort")
+    if sort:
+        field, _, direction = sort.partition(",")
+        records = sorted(records, key=lambda r: (r.get(field) is None, r.get(field)), reverse=direction == "desc")
+    else:
+        records = sorted(records, key=lambda r: r.get(id_field) or 0)
+    return {
+        "content": records[page * size:(page + 1) * size],
+        "number": page,
+        "size": size,
+        "totalElements": len(records),
+        "totalPages": math.ceil(len(records) / size) if size else 0,
+    }
+
+# (method, path regex) -> (collection, action); action names map to MockHandler._handle_<action>
+# (not do_<action>, which BaseHTTPRequestHandler would dispatch an HTTP method of that name to)
+ROUTES = [
+    ("GET", r"/getAllStudents", "students", "list"),
+    ("GET", r"/students", "students", "page"),
+    ("GET", r"/getStudent", "students", "get_by_query"),
+    ("POST", r"/addStudent|/students", "students", "create"),
+    ("GET", r"/exams/all|/getAllExams", "exams", "list"),
+    ("GET", r"/exams", "exams", "page"),
+    ("POST", r"/exams", "exams", "create"),
+    ("PUT", r"/exams", "exams", "update_body"),
+    ("GET", r"/exams/(\d+)", "exams", "get"),
+    ("DELETE", r"/exams/(\d+)", "exams", "delete"),
+    ("GET", r"/getRegions", "regions", "list"),
+    ("GET", r"/regions", "regions", "page"),
+    ("POST", r"/addregion|/regions", "regions", "create"),
+    ("GET", r"/getAllExamCentres", "centres", "list"),
+    ("GET", r"/exam-centres", "centres", "page"),
+    ("POST", r"/addExamCentre|/exam-centres", "centres", "create"),
+    ("GET", r"/getAllSchools", "schools", "list"),
+    ("GET", r"/schools", "schools", "page"),
+    ("POST", r"/addSchool|/schools", "schools", "create"),
+    ("PUT", r"/schools", "schools", "update_body"),
+    ("GET", r"/getAllApplications", "applications", "list"),
+    ("GET", r"/exam-applications", "applications", "page"),
+    ("POST", r"/fill-form", "applications", "create"),
+    ("GET", r"/get-form", "applications", "get_by_query"),
+    ("GET", r"/getAllResults", "results", "list"),
+    ("GET", r"/exam-results", "results", "page"),
+    ("POST", r"/addExamResult", "results", "create"),
+    ("GET", r"/getExamResult", "results", "get_by_query"),
+    ("GET", r"/getStudentResults", "results", "filter_by_query"),
+    ("GET", r"/getAllStudentProfiles", "profiles", "list"),
+    ("GET", r"/studentProfiles", "profiles", "page"),
+    ("POST", r"/addStudentProfile|/studentProfiles", "profiles", "create"),
+    ("GET", r"/studentProfiles/(\d+)|/getStudentProfile(?:ById)?", "profiles", "get"),
+    ("PUT", r"/studentProfiles/(\d+)", "profiles", "update"),
+    ("DELETE", r"/studentProfiles/(\d+)", "profiles", "delete"),
+    ("POST", r"/files/upload", "files", "upload"),
+    ("DELETE", r"/files/upload", "files", "delete_file"),
+    ("GET", r"/files/(.+)", "files", "download"),
+]
+COMPILED_ROUTES = [(m, re.compile(f"(?:{p})$"), c, a) for m, p, c, a in ROUTES]
+
+# Query parameter used to look a single record up on the legacy endpoints
+QUERY_IDS = {"students": "id", "applications": "applicationId", "results": "applicationId", "profiles": "id"}
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    store = None
+    cache = None
+    etag = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload, cache_state="MISS", content_type="application/json", headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        if self.etag and self.command == "GET" and status == 200:
+            # Same behaviour as Spring's ShallowEtagHeaderFilter: hash the body, 304 on a match
+            tag = f'"{hashlib.md5(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == tag:
+                self.send_response(304)
+                self.send_header("ETag", tag)
+                self.send_header("X-Cache", cache_state)
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("ETag", tag)
+        else:
+            self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Cache", cache_state)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        for route_method, pattern, collection, action in COMPILED_ROUTES:
+            match = pattern.match(url.path)
+            if route_method == method and match:
+                status, payload = getattr(self, f"_handle_{action}")(collection, match, query)
+                rows = len(payload.get("content", [])) if isinstance(payload, dict) else (
+                    len(payload) if isinstance(payload, list) else 1)
+                key = url.path + "?" + url.query
+                delay, cache_state = self.cache.latency(method, url.path, key, collection, rows)
+                if delay:
+                    time.sleep(delay)
+                if isinstance(payload, tuple):
+                    return self._reply(status, payload[0], cache_state, *payload[1:])
+                return self._reply(status, payload, cache_state)
+        self._reply(404, {"error": f"No mock route for {method} {url.path}"})
+
+    def do_GET(self): self._dispatch("GET")
+    def do_POST(self): self._dispatch("POST")
+    def do_PUT(self): self._dispatch("PUT")
+    def do_DELETE(self): self._dispatch("DELETE")
+
+    # --- actions ---
+
+    def _handle_list(self, collection, match, query):
+        return 200, self.store.list(collection)
+
+    def _handle_page(self, collection, match, query):
+        return 200, paginate(self.store.list(collection), query, COLLECTIONS[collection][0])
+
+    def _handle_get(self, collection, match, query):
+        raw_id = match.group(1) if match.groups() and match.group(1) else query.get("id")
+        record = self.store.get(collection, int(raw_id)) if raw_id and raw_id.isdigit() else None
+        return (200, record) if record else (404, {"error": "Not found"})
+
+    def _handle_get_by_query(self, collection, match, query):
+        field = QUERY_IDS[collection]
+        value = query.get(field)
+        if collection in ("students", "applications"):
+            record = self.store.get(collection, int(value)) if value and value.isdigit() else None
+        else:
+            record = next((r for r in self.store.list(collection) if str(r.get(field)) == value), None)
+        return (200, record) if record else (404, {"error": "Not found"})
+
+    def _handle_filter_by_query(self, collection, match, query):
+        return 200, [r for r in self.store.list(collection)
+                     if all(str(r.get(k)) == v for k, v in query.items())]
+
+    def _handle_create(self, collection, match, query):
+        record = json.loads(self._body() or b"{}")
+        # Parent IDs arrive as query params (?schoolId=, ?regionId=...)
+        for key, value in query.items():
+            record.setdefault(key, int(value) if value.isdigit() else value)
+        # Nested references ({"application": {"applicationId": 5}}) are flattened like the backend's DTOs
+        for value in list(record.values()):
+            if isinstance(value, dict) and len(value) == 1:
+                (ref_key, ref_id), = value.items()
+                record.setdefault(ref_key, ref_id)
+        if collection == "results":
+            application = self.store.get("applications", record.get("applicationId"))
+            if application:
+                record.setdefault("studentId", application.get("studentId"))
+        return 201, self.store.create(collection, record)
+
+    def _handle_update(self, collection, match, query):
+        record = self.store.update(collection, int(match.group(1)), json.loads(self._body() or b"{}"))
+        return (200, record) if record else (404, {"error": "Not found"})
+
+    def _handle_update_body(self, collection, match, query):
+        changes = json.loads(self._body() or b"{}")
+        record = self.store.update(collection, changes.get(COLLECTIONS[collection][0]), changes)
+        return (200, record) if record else (404, {"error": "Not found"})
+
+    def _handle_delete(self, collection, match, query):
+        return (200, {"deleted": True}) if self.store.delete(collection, int(match.group(1))) else (404, {"error": "Not found"})
+
+    def _handle_upload(self, collection, match, query):
+        header = f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode()
+        message = BytesParser().parsebytes(header + self._body())
+        host = self.headers.get("Host", "localhost")
+        files = {part.get_filename(): part.get_payload(decode=True) for part in message.get_payload()}
+        existing = self.store.add_files(files)
+        if existing is not None:
+            return 500, {"error": f"Object {existing} already exists"}
+        return 200, {name: f"http://{host}/files/{name}" for name in files}
+
+    def _handle_delete_file(self, collection, match, query):
+        found = self.store.delete_file(query.get("objectName"))
+        return (200, {"deleted": True}) if found else (404, {"error": "Not found"})
+
+    def _handle_download(self, collection, match, query):
+        data = self.store.get_file(match.group(1))
+        if data is None:
+            return 404, {"error": "Not found"}
+        # Single byte ranges ("bytes=start-end" or "bytes=start-") as MinIO serves them
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+            if start >= len(data):
+                return 416, (b"", "application/octet-stream", {"Content-Range": f"bytes */{len(data)}"})
+            return 206, (data[start:end + 1], "application/octet-stream",
+                         {"Content-Range": f"bytes {start}-{end}/{len(data)}", "Accept-Ranges": "bytes"})
+        return 200, (data, "application/octet-stream", {"Accept-Ranges": "bytes"})
+
+def load_profile(name):
+    if name in LATENCY_PROFILES:
+        return LATENCY_PROFILES[name]
+    with open(name) as f:
+        profile = json.load(f)
+    profile.setdefault("default", {"cold": 0, "warm": 0})
+    return profile
+
+class MockHTTPServer(ThreadingHTTPServer):
+    # A deep accept backlog so burst tests (thousands of simultaneous connects) are not refused
+    request_queue_size = 1024
+    daemon_threads = True
+
+def make_server(host="127.0.0.1", port=8080, profile="none", scale=1.0, synthetic=0, fixtures_dir=FIXTURES_DIR,
+                etag=False):
+    handler = type("Handler", (MockHandler,), {
+        "store": Store(fixtures_dir, synthetic),
+        "cache": CacheModel(load_profile(profile), scale),
+        "etag": etag,
+    })
+    return MockHTTPServer((host, port), handler)
+
+def start_in_background(**kwargs):
+    # For scripts and CI: returns (server, base_url) with the server on a daemon thread
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the backend, served from output_json/ fixtures")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--profile", default="none",
+                        help=f"Latency profile: {', '.join(LATENCY_PROFILES)} or a JSON file of {{path: {{cold, warm, per_row}}}}")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="Multiply every profile latency")
+    parser.add_argument("--synthetic", type=int, default=0, help="Grow each collection to this many records")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--etag", action="store_true", help="Send ETags and answer If-None-Match with 304")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.profile, args.latency_scale, args.synthetic, args.fixtures,
+                         args.etag)
+    print(f"Mock backend on http://{args.host}:{args.port} (profile {args.profile}, "
+          f"synthetic {args.synthetic or 'off'}). Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+
+from stats import percentile, fmt_seconds
+
+PERF_LOG_PATH = os.environ.get("PERF_LOG_PATH", "performance.jsonl")
+FLUSH_EVERY = 100
+
+# Explicit cold/warm tag for this run; when unset the first hit of a request is "cold", repeats are "warm"
+CACHE_TAG = os.environ.get("PERF_CACHE_TAG") or None
+RUN_ID = os.environ.get("PERF_RUN_ID") or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+RUN_NOTE = os.environ.get("PERF_RUN_NOTE", "")
+
+_buffer = []
+_seen = set()
+_lock = threading.Lock()
+
+def _request_key(method, endpoint, params):
+    return (method, endpoint, json.dumps(params or {}, sort_keys=True))
+
+def record(endpoint, method, params, status, size, timing, cache=None):
+    with _lock:
+        key = _request_key(method, endpoint, params)
+        if cache is None:
+            cache = CACHE_TAG or ("warm" if key in _seen else "cold")
+        _seen.add(key)
+        _buffer.append({
+            "run_id": RUN_ID,
+            "note": RUN_NOTE,
+            "ts": time.time(),
+            "endpoint": endpoint,
+            "method": method,
+            "params": params or {},
+            "status": status,
+            "bytes": size,
+            "dns": timing.get("dns"),
+            "connect": timing.get("connect"),
+            "ttfb": timing.get("ttfb"),
+            "server": timing.get("server"),
+            "download": timing.get("download"),
+            "decode": timing.get("decode"),
+            "total": timing.get("total"),
+            "cache": cache,
+        })
+        if len(_buffer) >= FLUSH_EVERY:
+            _flush_locked()
+
+def _flush_locked():
+    if not _buffer:
+        return
+    # One unbuffered append per flush, so several load processes can share the log without interleaving
+    with open(PERF_LOG_PATH, "ab", buffering=0) as f:
+        f.write("".join(json.dumps(r) + "\n" for r in _buffer).encode())
+    _buffer.clear()
+
+def flush():
+    with _lock:
+        _flush_locked()
+
+atexit.register(flush)
+
+def load_records(path=None, run_ids=None):
+    records = []
+    path = path or PERF_LOG_PATH
+    if not os.path.exists(path):
+        return records
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            r = json.loads(line)
+            if not run_ids or r["run_id"] in run_ids:
+                records.append(r)
+    return records
+
+def list_runs(records):
+    runs = {}
+    for r in records:
+        run = runs.setdefault(r["run_id"], {"note": r.get("note", ""), "start": r["ts"], "count": 0})
+        run["start"] = min(run["start"], r["ts"])
+        run["count"] += 1
+    return runs
+
+def cache_report(records):
+    # Per endpoint median cold vs warm total time, the comparison performance.txt was read for by eye
+    rows = {}
+    for r in records:
+        if r["status"] is None or r["status"] >= 400:
+            continue
+        row = rows.setdefault((r["method"], r["endpoint"]), {"cold": [], "warm": []})
+        if r["cache"] in row:
+            row[r["cache"]].append(r["total"])
+    return rows
+
+def print_cache_report(rows):
+    print(f"\n{'Endpoint':<30}{'Cold n':>7}{'Cold p50':>11}{'Warm n':>7}{'Warm p50':>11}{'Speedup':>9}")
+    for (method, endpoint), row in rows.items():
+        cold = percentile(row["cold"], 50)
+        warm = percentile(row["warm"], 50)
+        speedup = f"{cold / warm:.1f}x" if cold and warm else "-"
+        print(f"{method + ' ' + endpoint:<30}{len(row['cold']):>7}{fmt_seconds(cold):>11}"
+              f"{len(row['warm']):>7}{fmt_seconds(warm):>11}{speedup:>9}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the structured performance log")
+    parser.add_argument("--log", default=PERF_LOG_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("runs", help="List recorded runs")
+    report = sub.add_parser("report", help="Cold vs warm comparison per endpoint")
+    report.add_argument("--run", action="append", help="Restrict to these run IDs (repeatable)")
+    args = parser.parse_args()
+
+    if args.command == "runs":
+        for run_id, run in sorted(list_runs(load_records(args.log)).items(), key=lambda x: x[1]["start"]):
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["start"]))
+            print(f"{run_id}  {started}  {run['count']:>6} requests  {run['note']}")
+    elif args.command == "report":
+        print_cache_report(cache_report(load_records(args.log, args.run)))
+
+if __name__ == "__main__":
+    main()
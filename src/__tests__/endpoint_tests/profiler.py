@@ -0,0 +1,139 @@
+import argparse
+import gzip
+import json
+import os
+import time
+import zlib
+
+import test
+from test import LIST_ENDPOINTS, LEGACY_TWINS, list_params, send_request, log_performance
+
+CHUNK = 64 * 1024
+TOP_FIELDS = 5
+
+def decompress(data, encoding):
+    if encoding in ("gzip", "deflate"):
+        # wbits=47 auto-detects gzip or zlib headers
+        return zlib.decompress(data, 47)
+    return data
+
+def records_of(data):
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict) and isinstance(data.get("content"), list):
+        return data["content"]
+    return [data] if data else []
+
+def field_weights(records):
+    # Serialized bytes per top-level field summed over all records, plus which fields carry nesting
+    weights, nested = {}, set()
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for key, value in record.items():
+            weights[key] = weights.get(key, 0) + len(json.dumps(value, separators=(",", ":")))
+            if isinstance(value, (dict, list)) and value:
+                nested.add(key)
+            elif isinstance(value, str) and value[:1] in "[{":
+                # JSON stored as a string (papers, exam_details, resultData) is nesting too
+                nested.add(key)
+    return weights, nested
+
+def profile_endpoint(method, path, params=None):
+    response, timing = send_request(method, path, params=params, stream=True,
+                                    headers={"Accept-Encoding": "gzip, deflate"})
+    with response:
+        encoding = response.headers.get("Content-Encoding", "identity")
+        start = time.perf_counter()
+        wire = b"".join(response.raw.stream(CHUNK, decode_content=False))
+        download = time.perf_counter() - start
+    start = time.perf_counter()
+    body = decompress(wire, encoding)
+    data = json.loads(body)
+    decode = time.perf_counter() - start
+    timing["total"] += download + decode
+    log_performance(path, method, params, response, timing, size=len(body))
+
+    records = records_of(data)
+    weights, nested = field_weights(records)
+    total_field_bytes = sum(weights.values()) or 1
+    heaviest = sorted(weights.items(), key=lambda kv: kv[1], reverse=True)[:TOP_FIELDS]
+    return {
+        "status": response.status_code,
+        "encoding": encoding,
+        "wire_bytes": len(wire),
+        "bytes": len(body),
+        "gzip_bytes": len(gzip.compress(body)) if encoding == "identity" else len(wire),
+        "records": len(records),
+        "bytes_per_record": len(body) / len(records) if records else None,
+        "fields": sorted(weights),
+        "nested_fields": sorted(nested),
+        "heaviest_fields": [{"field": k, "bytes": v, "share": v / total_field_bytes} for k, v in heaviest],
+        "ttfb": timing["ttfb"],
+        "download": download,
+        "decode": decode,
+        "total": timing["total"],
+    }
+
+def over_fetching(profiles):
+    # Compares each legacy endpoint with its RESTful twin
+    findings = []
+    for legacy, restful in LEGACY_TWINS.items():
+        a, b = profiles.get(legacy), profiles.get(restful)
+        if not a or not b or not a["bytes_per_record"] or not b["bytes_per_record"]:
+            continue
+        ratio = a["bytes_per_record"] / b["bytes_per_record"]
+        extra = sorted(set(a["fields"]) - set(b["fields"]))
+        extra_nested = sorted(set(a["nested_fields"]) - set(b["nested_fields"]))
+        if ratio > 1.1 or extra or extra_nested:
+            findings.append({
+                "legacy": legacy, "restful": restful, "ratio": ratio,
+                "extra_fields": extra, "extra_nested": extra_nested,
+            })
+    return findings
+
+def print_report(profiles, findings):
+    print(f"\n{'Endpoint':<24}{'Recs':>6}{'Bytes':>10}{'Gzip':>9}{'B/rec':>8}"
+          f"{'TTFB':>9}{'Download':>10}{'Decode':>9}  Heaviest fields")
+    for path, p in profiles.items():
+        bpr = f"{p['bytes_per_record']:.0f}" if p["bytes_per_record"] else "-"
+        heavy = ", ".join(f"{h['field']} {h['share']:.0%}" for h in p["heaviest_fields"][:3])
+        print(f"{path:<24}{p['records']:>6}{p['bytes']:>10}{p['gzip_bytes']:>9}{bpr:>8}"
+              f"{p['ttfb']:>8.3f}s{p['download']:>9.3f}s{p['decode']:>8.3f}s  {heavy}")
+
+    if findings:
+        print("\nOver-fetching (legacy vs RESTful twin):")
+        for f in findings:
+            line = f"  {f['legacy']} is {f['ratio']:.1f}x the bytes/record of {f['restful']}"
+            if f["extra_fields"]:
+                line += f"; extra fields: {', '.join(f['extra_fields'])}"
+            if f["extra_nested"]:
+                line += f"; extra nested: {', '.join(f['extra_nested'])}"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Response size and payload shape profile of the list endpoints")
+    parser.add_argument("--endpoint", action="append", help="Limit to these paths (repeatable)")
+    parser.add_argument("--out", default=os.path.join("output", "payload_profile.json"))
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    profiles = {}
+    for method, path in LIST_ENDPOINTS:
+        if args.endpoint and path not in args.endpoint:
+            continue
+        try:
+            profiles[path] = profile_endpoint(method, path, list_params(path))
+        except Exception as e:
+            print(f"{path}: Error: {e}")
+    findings = over_fetching(profiles)
+    print_report(profiles, findings)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"endpoints": profiles, "over_fetching": findings}, f, indent=4)
+    print(f"\nProfile saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import csv
+import math
+import os
+import statistics
+import subprocess
+import sys
+
+import test
+from test import send_request, log_performance
+from paginate import PAGINATED_ENDPOINTS
+from stats import linear_fit, fmt_seconds
+
+DEFAULT_SIZES = "10,20,50,100,200,500,1000"
+DEPTH_POINTS = (0, 0.1, 0.25, 0.5, 0.75, 1.0)  # Fractions of the last page
+RISE_FACTOR = 2.0  # Upper-half cost per row vs lower half before flagging
+DEEP_FACTOR = 2.0  # Deepest page vs page 0 before flagging
+MIN_EFFECT = 0.01  # Ignore differences under 10 ms, they are noise at these sizes
+# Collections that seed.py grows with --students; the others stay the same size between seeding steps.
+# Applications and results only grow when the seeded students have exams to apply to.
+STUDENT_GROWN = ("/students", "/studentProfiles")
+EXAM_GROWN = ("/exam-applications", "/exam-results")
+CSV_FIELDS = ["step", "endpoint", "sweep", "page", "size", "rows", "total_elements", "bytes", "cold", "warm"]
+
+def measure(path, page, size, repeats):
+    # First request of a (page, size) key is the cache miss; the median of the rest is the warm time
+    params = {"page": str(page), "size": str(size)}
+    times, data, body_bytes = [], None, 0
+    for _ in range(repeats):
+        response, timing = send_request("GET", path, params=params)
+        log_performance(path, "GET", params, response, timing)
+        response.raise_for_status()
+        times.append(timing["total"])
+        if data is None:
+            data, body_bytes = response.json(), len(response.content)
+    return {
+        "page": page,
+        "size": size,
+        "rows": len(data.get("content", [])),
+        "total_elements": data.get("totalElements"),
+        "bytes": body_bytes,
+        "cold": times[0],
+        "warm": statistics.median(times[1:]) if len(times) > 1 else None,
+    }
+
+def sweep_endpoint(path, sizes, depth_size, repeats):
+    # A (page, size) point is measured once; re-requesting it would only ever see a warm cache
+    measured = {}
+    def point(page, size, sweep):
+        if (page, size) not in measured:
+            measured[page, size] = measure(path, page, size, repeats)
+        return dict(measured[page, size], sweep=sweep)
+    size_rows = [point(0, size, "size") for size in sizes]
+    total = size_rows[0]["total_elements"] or 0
+    last_page = max(math.ceil(total / depth_size) - 1, 0)
+    pages = sorted({round(last_page * f) for f in DEPTH_POINTS})
+    return size_rows + [point(page, depth_size, "depth") for page in pages]
+
+def analyse(rows, metric):
+    # Fits latency against rows returned and flags rising per-row cost and slow deep pages
+    points = sorted((r["rows"], r[metric]) for r in rows if r["sweep"] == "size" and r[metric] is not None)
+    points = [p for i, p in enumerate(points) if i == 0 or p[0] != points[i - 1][0]]
+    xs, ys = [p[0] for p in points], [p[1] for p in points]
+    slope, intercept, r2 = linear_fit(xs, ys)
+    result = {"per_row": slope, "fixed": intercept, "r2": r2, "flags": []}
+
+    half = len(points) // 2
+    if half >= 2:
+        low, _, _ = linear_fit(xs[:half + 1], ys[:half + 1])
+        high, _, _ = linear_fit(xs[half:], ys[half:])
+        result["per_row_low"], result["per_row_high"] = low, high
+        # A flat or negative lower half means fixed overhead and noise dominate small pages; no baseline
+        if low and low > 0 and high > RISE_FACTOR * low and (high - low) * xs[-1] > MIN_EFFECT:
+            result["flags"].append(f"cost per row rises {high / low:.1f}x at larger pages")
+
+    depth = sorted((r["page"], r[metric]) for r in rows if r["sweep"] == "depth" and r[metric] is not None)
+    if len(depth) > 1:
+        first, deepest = depth[0][1], depth[-1][1]
+        result["deep_ratio"] = deepest / first if first else None
+        if first and deepest / first > DEEP_FACTOR and deepest - first > MIN_EFFECT:
+            result["flags"].append(f"page {depth[-1][0]} is {deepest / first:.1f}x slower than page 0 (offset scan)")
+    return result
+
+def seed_to(students, base_url, state, exam_nos=None):
+    # seed.py is deterministic and resumable, so each step only adds the missing students (with their
+    # profiles, and an application and usually a result per student when exam_nos is given)
+    print(f"\nSeeding up to {students} students...")
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "seed.py")
+    command = [sys.executable, script, "--students", str(students), "--state", state, "--base-url", base_url]
+    for exam_no in exam_nos or []:
+        command += ["--exam-no", str(exam_no)]
+    subprocess.run(command, check=True)
+
+def grown_endpoints(endpoints, exam_nos):
+    grown = STUDENT_GROWN + (EXAM_GROWN if exam_nos else ())
+    return [p for p in endpoints if p in grown]
+
+def print_report(step, analyses, metric):
+    print(f"\n[{step}] {metric} latency vs rows returned")
+    print(f"{'Endpoint':<22}{'Total':>8}{'Fixed':>10}{'ms/row':>9}{'R²':>6}{'Deep x':>8}  Flags")
+    for path, a in analyses.items():
+        per_row = f"{a['per_row'] * 1000:.3f}" if a["per_row"] is not None else "-"
+        r2 = f"{a['r2']:.2f}" if a["r2"] is not None else "-"
+        deep = f"{a['deep_ratio']:.1f}" if a.get("deep_ratio") else "-"
+        print(f"{path:<22}{a['total'] or 0:>8}{fmt_seconds(a['fixed']):>10}{per_row:>9}{r2:>6}{deep:>8}  "
+              f"{'; '.join(a['flags']) or '-'}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep page size, page depth and dataset size per paginated endpoint")
+    parser.add_argument("--endpoint", action="append", help="Limit to these paths (repeatable)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Page sizes to try (default {DEFAULT_SIZES})")
+    parser.add_argument("--depth-size", type=int, default=20, help="Page size used for the page-depth sweep")
+    parser.add_argument("--repeats", type=int, default=3, help="Requests per point (first is the cold one)")
+    parser.add_argument("--metric", choices=("cold", "warm"), default="cold", help="Latency used for the fits")
+    parser.add_argument("--seed-students", help="Comma-separated student totals to seed up to between sweeps")
+    parser.add_argument("--seed-exam-no", type=int, action="append",
+                        help="Existing exam the seeded students apply to (repeatable); without it only "
+                             "/students and /studentProfiles grow between steps")
+    parser.add_argument("--seed-state", default="seed_state.jsonl")
+    parser.add_argument("--out", default=os.path.join("output", "scaling.csv"))
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    sizes = [int(s) for s in args.sizes.split(",")]
+    endpoints = [p for p in PAGINATED_ENDPOINTS if not args.endpoint or p in args.endpoint]
+    steps = ["current"] + (args.seed_students.split(",") if args.seed_students else [])
+    if args.metric == "warm" and args.repeats < 2:
+        parser.error("--metric warm needs --repeats of at least 2")
+    # Seeding steps only re-sweep the collections the seeding grows; the rest would measure the same data
+    grown = grown_endpoints(endpoints, args.seed_exam_no)
+    if args.seed_students:
+        if not grown:
+            parser.error(f"--seed-students only grows {', '.join(STUDENT_GROWN + EXAM_GROWN)} "
+                         f"(the last two with --seed-exam-no); none of them is selected")
+        print(f"Seeding steps sweep {', '.join(grown)} only")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for step in steps:
+            if step != "current":
+                seed_to(int(step), args.base_url, args.seed_state, args.seed_exam_no)
+            analyses = {}
+            for path in (endpoints if step == "current" else grown):
+                print(f"[{step}] Sweeping {path}...")
+                try:
+                    rows = sweep_endpoint(path, sizes, args.depth_size, args.repeats)
+                except Exception as e:
+                    print(f"{path}: Error: {e}")
+                    continue
+                for row in rows:
+                    writer.writerow(dict(row, step=step, endpoint=path))
+                f.flush()
+                analyses[path] = dict(analyse(rows, args.metric), total=rows[0]["total_elements"])
+            print_report(step, analyses, args.metric)
+    print(f"\nChart data saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
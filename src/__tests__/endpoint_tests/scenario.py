@@ -0,0 +1,176 @@
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import test
+from test import send_request, log_performance
+from stats import summarize, fmt_seconds
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+VAR_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
+class ScenarioError(Exception):
+    pass
+
+def load_scenario(path):
+    with open(path) as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ScenarioError("PyYAML is not installed; use a .json scenario or pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def builtin_vars():
+    return {"timestamp": int(time.time()), "uuid": uuid.uuid4().hex[:8]}
+
+def render(value, variables):
+    # "${x}" alone keeps the variable's type; embedded "${x}" is interpolated as text
+    if isinstance(value, str):
+        whole = VAR_PATTERN.fullmatch(value)
+        if whole:
+            return lookup_var(variables, whole.group(1))
+        return VAR_PATTERN.sub(lambda m: str(lookup_var(variables, m.group(1))), value)
+    if isinstance(value, dict):
+        return {k: render(v, variables) for k, v in value.items()}
+    if isinstance(value, list):
+        return [render(v, variables) for v in value]
+    return value
+
+def lookup_var(variables, name):
+    if name not in variables:
+        raise ScenarioError(f"Undefined variable: {name}")
+    return variables[name]
+
+def extract(data, dotted):
+    # "content.0.studentId" walks dicts by key and lists by index
+    for part in dotted.split("."):
+        if isinstance(data, list):
+            data = data[int(part)]
+        elif isinstance(data, dict):
+            data = data[part]
+        else:
+            raise KeyError(dotted)
+    return data
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.steps = {}
+
+    def add(self, name, elapsed, ok):
+        with self.lock:
+            entry = self.steps.setdefault(name, {"latencies": [], "errors": 0})
+            entry["latencies"].append(elapsed)
+            if not ok:
+                entry["errors"] += 1
+
+def run_step_once(step, variables, recorder):
+    method = step.get("method", "GET").upper()
+    path = render(step["path"], variables)
+    params = render(step.get("params"), variables)
+    body = render(step.get("body"), variables)
+    response, timing = send_request(method, path, params=params, body=body)
+    log_performance(path, method, params, response, timing)
+
+    expected = step.get("expect_status")
+    ok = response.status_code in expected if isinstance(expected, list) else (
+        response.status_code == expected if expected else response.status_code < 400)
+    recorder.add(step.get("name", f"{method} {step['path']}"), timing["total"], ok)
+    if not ok:
+        raise ScenarioError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+
+    captures = step.get("capture") or {}
+    if captures:
+        data = response.json()
+        for var, dotted in captures.items():
+            variables[var] = extract(data, dotted)
+
+def run_step(step, variables, recorder):
+    repeat = step.get("repeat", 1)
+    concurrency = step.get("concurrency", 1)
+    if repeat == 1:
+        run_step_once(step, variables, recorder)
+        return
+    # Repeated copies see the variables as they were; the last copy's captures win
+    def one(i):
+        scoped = dict(variables, step_iteration=i)
+        run_step_once(step, scoped, recorder)
+        return scoped
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(repeat)))
+    for var in step.get("capture") or {}:
+        variables[var] = results[-1][var]
+
+def run_iteration(scenario, iteration, recorder):
+    variables = builtin_vars()
+    variables.update(scenario.get("variables") or {})
+    variables["iteration"] = iteration
+    for step in scenario["steps"]:
+        run_step(step, variables, recorder)
+
+def run_scenario(scenario, iterations=None, concurrency=None):
+    iterations = iterations or scenario.get("iterations", 1)
+    concurrency = concurrency or scenario.get("concurrency", 1)
+    recorder = Recorder()
+    failures = []
+
+    def guarded(i):
+        try:
+            run_iteration(scenario, i, recorder)
+        except Exception as e:
+            failures.append((i, str(e)))
+            print(f"Iteration {i} failed: {e}")
+
+    print(f"\n--- Scenario: {scenario.get('name', 'unnamed')} "
+          f"({iterations} iterations, {concurrency} concurrent) ---")
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(guarded, range(iterations)))
+    elapsed = time.time() - start
+    return recorder, failures, elapsed
+
+def print_report(recorder, failures, elapsed, iterations):
+    print(f"\n{'Step':<34}{'Count':>7}{'Err':>6}{'p50':>11}{'p95':>11}{'max':>11}")
+    for name, entry in recorder.steps.items():
+        s = summarize(entry["latencies"])
+        print(f"{name:<34}{s['count']:>7}{entry['errors']:>6}{fmt_seconds(s['p50']):>11}"
+              f"{fmt_seconds(s['p95']):>11}{fmt_seconds(s['max']):>11}")
+    completed = iterations - len(failures)
+    print(f"\n{completed}/{iterations} iterations completed in {elapsed:.2f}s "
+          f"({completed / elapsed:.2f} iterations/s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a declarative JSON/YAML scenario headless")
+    parser.add_argument("scenario", help="Scenario file (.json, or .yaml with PyYAML installed)")
+    parser.add_argument("--iterations", type=int, help="Override the scenario's iteration count")
+    parser.add_argument("--concurrency", type=int, help="Override how many iterations run in parallel")
+    parser.add_argument("--var", action="append", default=[], help="Set a variable, e.g. --var studentId=5")
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    scenario = load_scenario(args.scenario)
+    for assignment in args.var:
+        name, _, value = assignment.partition("=")
+        scenario.setdefault("variables", {})[name] = int(value) if value.isdigit() else value
+
+    iterations = args.iterations or scenario.get("iterations", 1)
+    concurrency = args.concurrency or scenario.get("concurrency", 1)
+    http_client.configure(pool_size=max(concurrency, http_client.POOL_SIZE))
+    recorder, failures, elapsed = run_scenario(scenario, iterations, concurrency)
+    print_report(recorder, failures, elapsed, iterations)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import test
+from test import send_request
+
+FIRST_NAMES_MALE = ["Aarav", "Arjun", "Ishaan", "Vihaan", "Rohan", "Kabir", "Aryan", "Vivaan", "Aditya", "Sai"]
+FIRST_NAMES_FEMALE = ["Aditi", "Ananya", "Kavya", "Sanya", "Zoya", "Ishani", "Myra", "Kiara", "Diya", "Riya"]
+LAST_NAMES = ["Sharma", "Patel", "Verma", "Gupta", "Iyer", "Reddy", "Khan", "Singh", "Deshmukh", "Joshi"]
+CATEGORIES = ["General", "OBC", "SC", "ST"]
+BOARD_AFFILIATIONS = ["CBSE", "ICSE", "State Board", "International Board"]
+INSTRUCTION_MEDIUMS = ["English", "Hindi", "Marathi", "Standard"]
+MOTHER_TONGUES = ["Hindi", "Marathi", "Gujarati", "Tamil", "Bengali"]
+
+class SeedError(Exception):
+    pass
+
+# --- Payloads (same shapes as test.py menus and scripts/bulk-additions) ---
+
+def centre_payload(rng, region, index):
+    name = region["regionName"]
+    return {
+        "centreName": f"{name} Examination Centre {index + 1}",
+        "centreCode": f"{name[:3].upper()}-{index + 1}-{rng.randint(0, 99999)}",
+        "address": f"Main Street, {name}",
+        "pincode": "411001",
+    }
+
+def school_payload(rng, centre_name, index):
+    name = f"{centre_name} Model High School {index + 1}"
+    slug = name.lower().replace(" ", "")
+    return {
+        "schoolName": name,
+        "schoolCode": f"SCH-{rng.randint(0, 999999)}",
+        "boardAffiliation": rng.choice(BOARD_AFFILIATIONS),
+        "mediumOfInstruction": rng.choice(INSTRUCTION_MEDIUMS),
+        "establishmentYear": rng.randint(1980, 2020),
+        "principalName": f"Principal {rng.choice(LAST_NAMES)}",
+        "officialEmail": f"admin@{slug}.edu",
+        "seatingCapacity": rng.randint(200, 500),
+        "numberOfClassrooms": rng.randint(15, 35),
+        "cctvAvailable": True,
+        "address": {"line1": f"{rng.randint(1, 99)}, Education Square", "state": "Maharashtra", "pincode": "411002"},
+    }
+
+def student_payload(rng, index, seed=0):
+    male = index % 2 == 0
+    first = rng.choice(FIRST_NAMES_MALE if male else FIRST_NAMES_FEMALE)
+    last = rng.choice(LAST_NAMES)
+    return {
+        "firstName": first,
+        "lastName": last,
+        "middleName": "NMN",
+        "email": f"{first.lower()}.{last.lower()}.{seed}.{index}@example.com",
+        "contact": f"9{rng.randint(100000000, 999999999)}",
+        "age": rng.randint(12, 21),
+        "motherTongue": rng.choice(MOTHER_TONGUES),
+        "password": "password123",
+        "confirmPassword": "password123",
+    }
+
+def profile_payload(rng, student, index):
+    return {
+        "dateOfBirth": f"20{rng.randint(5, 14):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "gender": "Male" if index % 2 == 0 else "Female",
+        "category": rng.choice(CATEGORIES),
+        "previousExamName": "Junior Hindi Level 1",
+        "previousExamMarks": f"{rng.uniform(40, 99):.2f}",
+        "previousExamYear": 2024,
+        "previousExamRollNo": f"ROLL-{index}",
+        "fatherName": f"Mr. {student['lastName']}",
+        "motherName": f"Mrs. {student['lastName']}",
+        "guardianContact": f"9{rng.randint(100000000, 999999999)}",
+        "qualification": "10th Pass",
+        "idProofNumber": f"ID-{index}",
+        "profileCompletionStatus": "Complete",
+        "address": {"line1": f"{rng.randint(1, 999)}, Student Residence", "state": "Maharashtra", "pincode": "411005"},
+    }
+
+def exam_payload(rng, index):
+    return {
+        "exam_name": f"Seeded Hindi Exam {index + 1}",
+        "exam_code": f"SEED_{index + 1}_{rng.randint(0, 999999)}",
+        "status": "PUBLISHED",
+        "exam_fees": 1250.0,
+        "no_of_papers": 2,
+        "application_start_date": "2024-05-01",
+        "application_end_date": "2024-06-30",
+        "exam_start_date": "2024-08-10",
+        "exam_end_date": "2024-08-15",
+        "papers": json.dumps([
+            {"name": "Pratham Prashnpatra", "maxMarks": 100},
+            {"name": "Dvitiya Prashnpatra", "maxMarks": 100},
+        ]),
+        "exam_details": json.dumps({
+            "identity": {"examLevel": "PRAVIN", "language": "Hindi"},
+            "rules": {"passingCriteria": "40% in each paper"},
+        }),
+    }
+
+def application_payload(rng, student_id, exam_no):
+    return {
+        "student": {"studentId": student_id},
+        "exam": {"examNo": exam_no},
+        "formData": "{}",
+        "status": "PENDING",
+    }
+
+def result_payload(rng, application_id):
+    first, second = rng.randint(20, 100), rng.randint(20, 100)
+    total = first + second
+    return {
+        "application": {"applicationId": application_id},
+        "resultData": json.dumps({
+            "score": f"{total / 2:.2f}%",
+            "remarks": "Pass" if min(first, second) >= 40 else "Fail",
+            "totalMax": 200,
+            "breakdown": {"Pratham Prashnpatra": first, "Dvitiya Prashnpatra": second},
+            "totalObtained": total,
+        }),
+        "publishedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+# --- Seeding ---
+
+class Seeder:
+    def __init__(self, seed, state_path, max_in_flight):
+        self.seed = seed
+        self.state_path = state_path
+        self.done = self._load_state()
+        self.state_file = open(state_path, "a")
+        self.lock = threading.Lock()
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.created = 0
+        self.skipped = 0
+        self.failed = 0
+        self.start = time.time()
+        self.last_report = self.start
+
+    def _load_state(self):
+        done = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        done[entry["key"]] = entry["id"]
+        return done
+
+    def rng(self, key):
+        # Per-record RNG so every record is reproducible regardless of order or resume point
+        return random.Random(f"{self.seed}:{key}")
+
+    def create(self, key, path, payload_fn, id_field, params=None):
+        with self.lock:
+            if key in self.done:
+                self.skipped += 1
+                return self.done[key]
+        payload = payload_fn(self.rng(key))
+        response, _ = send_request("POST", path, params=params, body=payload)
+        if response.status_code >= 400:
+            raise SeedError(f"{path} {key}: {response.status_code} {response.text[:200]}")
+        data = response.json()
+        # Legacy endpoints name the key "id" rather than e.g. "resultId"
+        record_id = data.get(id_field, data.get("id")) if isinstance(data, dict) else None
+        if record_id is None:
+            # Not checkpointed, so a resume retries it instead of treating it as done
+            raise SeedError(f"{path} {key}: response has no {id_field}: {response.text[:200]}")
+        with self.lock:
+            self.done[key] = record_id
+            self.created += 1
+            # Flushed per record so a crash never loses a created ID
+            self.state_file.write(json.dumps({"key": key, "id": record_id}) + "\n")
+            self.state_file.flush()
+            self._progress()
+        return record_id
+
+    def _progress(self, force=False):
+        now = time.time()
+        if force or now - self.last_report >= 2:
+            self.last_report = now
+            elapsed = now - self.start
+            print(f"  created {self.created} (skipped {self.skipped}, failed {self.failed}) "
+                  f"{self.created / elapsed:.1f} records/s")
+
+    def submit(self, pool, fn, *args):
+        # Blocks once max_in_flight chains are queued so memory stays flat for 100k+ students
+        self.in_flight.acquire()
+        future = pool.submit(self._run, fn, *args)
+        future.add_done_callback(lambda _: self.in_flight.release())
+        return future
+
+    def _run(self, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            with self.lock:
+                self.failed += 1
+            print(f"  Error: {e}")
+
+def fetch_regions():
+    response, _ = send_request("GET", "/regions", params={"size": "1000"})
+    response.raise_for_status()
+    return response.json().get("content", [])
+
+def seed_all(args):
+    seeder = Seeder(args.seed, args.state, args.max_in_flight)
+    if seeder.done:
+        print(f"Resuming: {len(seeder.done)} records already created in {args.state}")
+
+    regions = fetch_regions()
+    if not regions:
+        print("No regions found. Please add at least one region first.")
+        return seeder
+
+    print("Creating centres and schools...")
+    schools = []
+    for region in regions:
+        for c in range(args.centres_per_region):
+            centre_key = f"centre:{region['regionId']}:{c}"
+            centre_id = seeder.create(centre_key, "/exam-centres", lambda rng: centre_payload(rng, region, c),
+                                      "centreId", params={"regionId": region["regionId"]})
+            centre_name = f"{region['regionName']} Examination Centre {c + 1}"
+            for s in range(args.schools_per_centre):
+                school_key = f"school:{region['regionId']}:{c}:{s}"
+                schools.append(seeder.create(school_key, "/schools", lambda rng: school_payload(rng, centre_name, s),
+                                             "schoolId", params={"centreId": centre_id}))
+
+    exams = list(args.exam_no or [])
+    for e in range(args.exams):
+        exams.append(seeder.create(f"exam:{e}", "/exams", lambda rng: exam_payload(rng, e), "examNo"))
+
+    def seed_student(i):
+        rng = seeder.rng(f"plan:{i}")
+        school_id = schools[i % len(schools)]
+        student = student_payload(seeder.rng(f"student:{i}"), i, seeder.seed)
+        student_id = seeder.create(f"student:{i}", "/students", lambda _: student, "studentId",
+                                   params={"schoolId": school_id})
+        seeder.create(f"profile:{i}", "/studentProfiles", lambda r: profile_payload(r, student, i),
+                      "profileId", params={"studentId": student_id})
+        for exam_no in rng.sample(exams, min(args.applications_per_student, len(exams))):
+            app_id = seeder.create(f"application:{i}:{exam_no}", "/fill-form",
+                                   lambda r: application_payload(r, student_id, exam_no), "applicationId")
+            if rng.random() < args.result_ratio:
+                seeder.create(f"result:{i}:{exam_no}", "/addExamResult",
+                              lambda r: result_payload(r, app_id), "id")
+
+    if not schools:
+        print("No schools to place students in.")
+        return seeder
+    print(f"Creating {args.students} students across {len(schools)} schools with {args.workers} workers...")
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for i in range(args.students):
+            seeder.submit(pool, seed_student, i)
+    seeder._progress(force=True)
+    return seeder
+
+def main():
+    parser = argparse.ArgumentParser(description="Deterministic, resumable bulk data generator")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--centres-per-region", type=int, default=1)
+    parser.add_argument("--schools-per-centre", type=int, default=2)
+    parser.add_argument("--exams", type=int, default=0, help="New exams to create")
+    parser.add_argument("--exam-no", type=int, action="append", help="Existing exam to apply to (repeatable)")
+    parser.add_argument("--applications-per-student", type=int, default=1)
+    parser.add_argument("--result-ratio", type=float, default=0.8, help="Share of applications that get a result")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--max-in-flight", type=int, default=64, help="Queued student chains before submission blocks")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--state", default="seed_state.jsonl", help="Checkpoint file used to resume after failures")
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+    if args.centres_per_region < 1 or args.schools_per_centre < 1:
+        parser.error("--centres-per-region and --schools-per-centre must be at least 1; students need a school")
+
+    test.BASE_URL = args.base_url
+    http_client.configure(pool_size=args.workers)
+    try:
+        seeder = seed_all(args)
+    except SeedError as e:
+        print(f"Error: {e}\nRe-run with the same --seed and --state to resume.")
+        sys.exit(1)
+    seeder.state_file.close()
+    if seeder.failed:
+        print(f"{seeder.failed} student chains failed; re-run with the same --seed and --state to resume.")
+
+if __name__ == "__main__":
+    main()
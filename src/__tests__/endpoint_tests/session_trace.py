@@ -0,0 +1,361 @@
+import argparse
+import atexit
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import http_client
+import live_metrics
+import perf_log
+import test
+from json_stream import open_output
+from stats import Histogram, fmt_seconds
+
+# Set TRACE_PATH (e.g. session.trace.gz) to record every make_request / handle_file_upload call as one
+# compact JSON line: method, path, params, body, upload descriptor, IDs a POST created, status, bytes
+# and timestamps.
+# The first line is a header; offsets are seconds since the first request started. test.py imports
+# this module, so test is only used through attribute access at call time.
+TRACE_PATH = os.environ.get("TRACE_PATH") or None
+TRACE_VERSION = 1
+LATE_AFTER = 0.01  # A replayed request sent this long after its due time counts as late
+
+_file = None
+_origin = None
+_lock = threading.Lock()
+
+def _dumps(record):
+    return (json.dumps(record, separators=(",", ":"), default=str) + "\n").encode()
+
+def created_ids(content, params=None, body=None):
+    # ID fields at the top of a POST response body that the request did not send itself (the server
+    # assigned them), so a replay can map them to the IDs it creates
+    if not TRACE_PATH or not content:
+        return None
+    from paginate import ID_FIELDS
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    sent = {(k, str(v)) for k, v in itertools.chain(_leaves(params or {}), _leaves(body))}
+    return {k: v for k, v in data.items()
+            if k in ID_FIELDS.values() and isinstance(v, (int, str)) and (k, str(v)) not in sent} or None
+
+def record(method, path, params, body, status, size, elapsed, upload=None, created=None):
+    if not TRACE_PATH:
+        return
+    global _file, _origin
+    now = time.perf_counter()
+    with _lock:
+        if _file is None:
+            os.makedirs(os.path.dirname(TRACE_PATH) or ".", exist_ok=True)
+            _file = open_output(TRACE_PATH, "wb")
+            _file.write(_dumps({"trace": TRACE_VERSION, "run_id": perf_log.RUN_ID, "base_url": test.BASE_URL,
+                                "started": time.time() - elapsed}))
+            _origin = now - elapsed
+        entry = {"offset": round(now - elapsed - _origin, 6), "ts": time.time() - elapsed, "method": method,
+                 "path": path, "params": params or None, "body": body, "status": status, "bytes": size,
+                 "elapsed": round(elapsed, 6)}
+        if upload:
+            entry["upload"] = upload
+        if created:
+            entry["created"] = created
+        _file.write(_dumps(entry))
+        # Interactive sessions end with Ctrl-C as often as with "q"; keep what was captured. A killed
+        # process never writes the gzip trailer, which load_trace tolerates.
+        _file.flush()
+
+def close():
+    global _file
+    with _lock:
+        if _file is not None:
+            _file.close()
+            _file = None
+
+atexit.register(close)
+
+def _read_trace(path):
+    # Returns (raw lines, complete). gzip.open raises at a missing trailer and loses the last block;
+    # a bare zlib decompressor hands back everything that was flushed before the process died.
+    if not path.endswith(".gz"):
+        with open(path, "rb") as f:
+            return f.read().split(b"\n"), True
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = []
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            data.append(decompressor.decompress(chunk))
+    return b"".join(data).split(b"\n"), decompressor.eof
+
+def load_trace(path):
+    raw, complete = _read_trace(path)
+    raw = [line for line in raw if line.strip()]
+    lines = []
+    for n, line in enumerate(raw):
+        try:
+            lines.append(json.loads(line))
+        except ValueError:
+            if n < len(raw) - 1:
+                raise
+            complete = False  # Cut off mid-record
+    if not complete:
+        print(f"Warning: {path} ends early (the capture was killed?); using the {max(len(lines) - 1, 0)} "
+              f"complete requests")
+    if not lines or "trace" not in lines[0]:
+        raise ValueError(f"{path} is not a session trace")
+    if lines[0]["trace"] != TRACE_VERSION:
+        raise ValueError(f"{path} is trace version {lines[0]['trace']}, expected {TRACE_VERSION}")
+    return lines[0], lines[1:]
+
+def schedule(entries, speed=1.0, max_gap=None):
+    # Replay offsets: recorded gaps (capped at max_gap, e.g. time spent typing at the menu) divided by speed
+    offsets, previous, shifted = [], None, 0.0
+    for entry in entries:
+        if previous is not None:
+            gap = entry["offset"] - previous
+            shifted += min(gap, max_gap) if max_gap is not None else gap
+        previous = entry["offset"]
+        offsets.append(shifted / speed)
+    return offsets
+
+def _leaves(value, key=None):
+    # (key, scalar) pairs of a JSON value; list items take the key of their list
+    if isinstance(value, dict):
+        for k, v in value.items():
+            yield from _leaves(v, k)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _leaves(v, key)
+    elif value is not None:
+        yield key, value
+
+def _path_ids(path):
+    # (index, ID field) of each path segment that is an ID, e.g. /exams/12 -> (2, "examNo")
+    from paginate import ID_FIELDS
+    parts = path.split("/")
+    return [(i, ID_FIELDS["/".join(parts[:i])]) for i in range(2, len(parts))
+            if "/".join(parts[:i]) in ID_FIELDS and parts[i]]
+
+def _references(entry):
+    # What a request may depend on: upload URLs in its body and (field, ID) pairs in its path, params or body
+    refs = set()
+    for key, value in itertools.chain(_leaves(entry.get("body")), _leaves(entry.get("params") or {})):
+        if isinstance(value, str):
+            refs.add(("url", value))
+        refs.add((key, str(value)))
+    parts = entry["path"].split("/")
+    refs.update((field, parts[i]) for i, field in _path_ids(entry["path"]))
+    return refs
+
+def dependencies(entries):
+    # For each entry, the earlier entries that uploaded a file it sends or created an ID it uses
+    producers, deps = {}, []
+    for i, entry in enumerate(entries):
+        deps.append(sorted({producers[ref] for ref in _references(entry) if ref in producers}))
+        if entry.get("upload", {}).get("url"):
+            producers["url", entry["upload"]["url"]] = i
+        for field, value in (entry.get("created") or {}).items():
+            producers[field, str(value)] = i
+    return deps
+
+def _substitute(value, urls, ids, key=None):
+    # Points a request at what this copy created instead of what the session did: uploaded file URLs,
+    # and IDs returned by earlier POSTs, matched by field name
+    if isinstance(value, dict):
+        return {k: _substitute(v, urls, ids, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_substitute(v, urls, ids, key) for v in value]
+    if isinstance(value, str) and value in urls:
+        return urls[value]
+    if value is not None and (key, str(value)) in ids:
+        new = ids[key, str(value)]
+        return str(new) if isinstance(value, str) else new
+    return value
+
+def _substitute_path(path, ids):
+    parts = path.split("/")
+    for i, field in _path_ids(path):
+        if (field, parts[i]) in ids:
+            parts[i] = str(ids[field, parts[i]])
+    return "/".join(parts)
+
+def _replay_upload(upload):
+    # Re-sends the recorded file when it is still on disk, otherwise a placeholder of the same size
+    name = test.make_unique_filename(os.path.basename(upload["file"]))
+    path, placeholder = upload["file"], None
+    if not os.path.exists(path) or os.path.getsize(path) != upload["size"]:
+        fd, placeholder = tempfile.mkstemp(prefix="trace_upload_")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"\0" * upload["size"])
+        path = placeholder
+    try:
+        body = http_client.MultipartStream([(upload["field"], name, path, upload["content_type"])])
+        response, timing = http_client.request("POST", f"{test.BASE_URL}/files/upload", data=body,
+                                               headers={"Content-Type": body.content_type})
+    finally:
+        if placeholder:
+            os.remove(placeholder)
+    test.log_performance("/files/upload", "POST", None, response, timing)
+    new_url = None
+    if response.status_code == 200:
+        urls = response.json()
+        new_url = urls.get(name) or next(iter(urls.values()), None)
+    return response, timing, new_url
+
+def replay(entries, speed=1.0, concurrency=1, copies=1, stagger=0.0, max_gap=None, quiet=False):
+    # Open loop like load.run_open_loop: each request is due at its scaled offset (plus copy * stagger)
+    # whether or not the earlier ones have returned; latency is measured from that due time.
+    # concurrency=1 with one copy preserves the recorded order exactly. With more, a request that sends
+    # a file URL or an ID waits for the request of its copy that uploaded or created it, and each copy
+    # substitutes its own URLs and IDs for the captured ones.
+    offsets = schedule(entries, speed, max_gap)
+    plan = sorted((copy * stagger + offset, copy, i) for copy in range(copies) for i, offset in enumerate(offsets))
+    deps = dependencies(entries)
+    results = {}
+    results_lock = threading.Lock()
+    uploaded = [{} for _ in range(copies)]
+    ids = [{} for _ in range(copies)]
+    finished = [[threading.Event() for _ in entries] for _ in range(copies)]
+
+    def fire(copy, i, due):
+        # The pool runs tasks in submission order and a dependency is always submitted first, so the
+        # waits below cannot take every worker while the request they wait for is still queued
+        entry = entries[i]
+        for dep in deps[i]:
+            finished[copy][dep].wait()
+        sent = time.perf_counter()
+        method, path = entry["method"], _substitute_path(entry["path"], ids[copy])
+        params = _substitute(entry.get("params"), uploaded[copy], ids[copy])
+        try:
+            if entry.get("upload"):
+                response, timing, new_url = _replay_upload(entry["upload"])
+                if new_url and entry["upload"].get("url"):
+                    uploaded[copy][entry["upload"]["url"]] = new_url
+            else:
+                body = _substitute(entry.get("body"), uploaded[copy], ids[copy])
+                response, timing = test.send_request(method, path, params=params, body=body)
+                test.log_performance(path, method, params, response, timing)
+                if entry.get("created") and response.status_code < 400:
+                    data = response.json()
+                    for field, old in entry["created"].items():
+                        if isinstance(data, dict) and data.get(field) is not None:
+                            ids[copy][field, str(old)] = data[field]
+            status, service = response.status_code, timing["total"]
+        except Exception:
+            status, service = "error", None
+        finally:
+            finished[copy][i].set()
+        done = time.perf_counter()
+        with results_lock:
+            row = results.setdefault(f"{method} {entry['path']}", {"histogram": Histogram(), "service": Histogram(),
+                                                          "statuses": {}, "errors": 0, "changed": 0, "late": 0})
+            row["statuses"][status] = row["statuses"].get(status, 0) + 1
+            if status == "error" or status >= 400:
+                row["errors"] += 1
+            if status != entry.get("status"):
+                row["changed"] += 1
+            if sent - due > LATE_AFTER:
+                row["late"] += 1
+            row["histogram"].record(done - due)
+            if service is not None:
+                row["service"].record(service)
+
+    if not quiet:
+        print(f"\n--- Replaying {len(entries)} requests x {copies} at {speed:g}x, concurrency {concurrency} ---")
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        for offset, copy, i in plan:
+            due = start + offset
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(fire, copy, i, due)
+    return results, time.time() - started
+
+def print_trace(header, entries):
+    started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(header["started"]))
+    print(f"Run {header['run_id']} against {header['base_url']}, started {started}")
+    for entry in entries:
+        what = f"{entry['method']} {entry['path']}"
+        if entry.get("params"):
+            what += "?" + "&".join(f"{k}={v}" for k, v in entry["params"].items())
+        if entry.get("upload"):
+            what += f" [{entry['upload']['file']}, {entry['upload']['size']} bytes]"
+        print(f"{entry['offset']:>10.3f}s  {entry['status']}  {fmt_seconds(entry['elapsed']):>9}  "
+              f"{entry['bytes']:>9}B  {what}")
+    if entries:
+        print(f"\n{len(entries)} requests over {entries[-1]['offset'] + entries[-1]['elapsed']:.1f}s")
+
+def print_report(results, elapsed_total):
+    # Latency is from the scheduled send time; "Svc p99" is the bare request time; "Changed" counts
+    # responses whose status differs from the one recorded
+    print(f"\n{'Request':<34}{'Reqs':>7}{'Err':>6}{'Changed':>9}{'Late':>6}{'p50':>11}{'p99':>11}"
+          f"{'max':>11}{'Svc p99':>11}")
+    total = 0
+    for name, row in sorted(results.items()):
+        hist = row["histogram"]
+        count = sum(row["statuses"].values())
+        total += count
+        print(f"{name:<34}{count:>7}{row['errors']:>6}{row['changed']:>9}{row['late']:>6}"
+              f"{fmt_seconds(hist.percentile(50)):>11}{fmt_seconds(hist.percentile(99)):>11}"
+              f"{fmt_seconds(hist.max):>11}{fmt_seconds(row['service'].percentile(99)):>11}")
+    print(f"\nTotal: {total} requests in {elapsed_total:.2f}s ({total / elapsed_total:.2f} req/s)")
+
+def parse_speed(text):
+    return float(text.lower().rstrip("x"))
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or replay a captured test.py session (TRACE_PATH=...)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="List the requests in a trace")
+    show.add_argument("trace")
+    run = sub.add_parser("replay", help="Send a trace again, time-scaled")
+    run.add_argument("trace")
+    run.add_argument("--speed", type=parse_speed, default=1.0, help="Time scale, e.g. 1x, 10x, 100x")
+    run.add_argument("--concurrency", type=int, default=1, help="Requests allowed in flight at once")
+    run.add_argument("--copies", type=int, default=1, help="Replay this many copies of the session together")
+    run.add_argument("--stagger", type=float, default=0.0, help="Seconds between the starts of each copy")
+    run.add_argument("--max-gap", type=float, help="Cap recorded idle gaps at this many seconds (before scaling)")
+    run.add_argument("--read-only", action="store_true", help="Skip everything except GETs")
+    run.add_argument("--metrics-port", type=int, help="Serve live Prometheus metrics on this local port")
+    run.add_argument("--live", type=float, metavar="SECONDS", help="Print a live summary line every SECONDS")
+    run.add_argument("--out", default=os.path.join("output", "replay.json"))
+    run.add_argument("--base-url", help="Target (default: the URL the trace was captured against)")
+    args = parser.parse_args()
+
+    header, entries = load_trace(args.trace)
+    if args.command == "show":
+        print_trace(header, entries)
+        return
+
+    test.BASE_URL = args.base_url or header["base_url"]
+    if args.read_only:
+        entries = [e for e in entries if e["method"] == "GET"]
+    if not entries:
+        parser.error("Nothing to replay")
+    with live_metrics.Exporter(args.metrics_port, args.live):
+        results, elapsed_total = replay(entries, args.speed, args.concurrency, args.copies, args.stagger,
+                                        args.max_gap)
+    print_report(results, elapsed_total)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"trace": args.trace, "speed": args.speed, "concurrency": args.concurrency, "copies": args.copies,
+                   "elapsed": elapsed_total,
+                   "requests": {name: {"statuses": {str(k): v for k, v in row["statuses"].items()},
+                                       "errors": row["errors"], "changed": row["changed"], "late": row["late"],
+                                       "latency": row["histogram"].summary(),
+                                       "service": row["service"].summary()}
+                                for name, row in results.items()}}, f, indent=4)
+    print(f"\nResults saved to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import math
+
+def percentile(values, pct):
+    # Nearest-rank percentile, values need not be sorted
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(values):
+    if not values:
+        return {"count": 0, "min": None, "p50": None, "p95": None, "p99": None, "max": None}
+    return {
+        "count": len(values),
+        "min": min(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+def linear_fit(xs, ys):
+    # Least-squares y = intercept + slope * x; returns (slope, intercept, r_squared)
+    n = len(xs)
+    if n < 2:
+        return None, None, None
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if not sxx:
+        return None, None, None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    intercept = mean_y - slope * mean_x
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    ss_res = sum((y - intercept - slope * x) ** 2 for x, y in zip(xs, ys))
+    return slope, intercept, 1 - ss_res / ss_tot if ss_tot else 1.0
+
+def fmt_seconds(value):
+    return "-" if value is None else f"{value:.4f}s"
+
+class Histogram:
+    # Log-bucketed (HDR-style) latency histogram: bounded relative error, constant memory,
+    # and histograms from separate threads or processes merge by adding bucket counts
+    def __init__(self, precision=0.01, lowest=1e-6):
+        self.precision = precision
+        self.lowest = lowest
+        self.counts = {}
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+
+    def _index(self, value):
+        return max(0, int(math.log(max(value, self.lowest) / self.lowest) / math.log1p(self.precision)))
+
+    def _upper(self, index):
+        return self.lowest * (1 + self.precision) ** (index + 1)
+
+    def record(self, value, count=1):
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.sum += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        if (other.precision, other.lowest) != (self.precision, self.lowest):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.sum += other.sum
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, pct):
+        # Nearest-rank over buckets; reports the bucket's upper bound, clamped to the observed range
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._upper(index), self.min), self.max)
+        return self.max
+
+    def count_at_most(self, value):
+        # Recorded values in buckets at or below value's bucket, for cumulative (Prometheus-style) buckets
+        limit = self._index(value)
+        return sum(n for index, n in self.counts.items() if index <= limit)
+
+    def summary(self):
+        if not self.count:
+            return summarize([])
+        return {
+            "count": self.count,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+    def to_dict(self):
+        return {"precision": self.precision, "lowest": self.lowest, "count": self.count, "sum": self.sum,
+                "min": self.min, "max": self.max, "counts": {str(k): v for k, v in self.counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data["precision"], data["lowest"])
+        hist.counts = {int(k): v for k, v in data["counts"].items()}
+        hist.count, hist.sum, hist.min, hist.max = data["count"], data["sum"], data["min"], data["max"]
+        return hist
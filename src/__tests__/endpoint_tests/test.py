@@ -1,56 +1,151 @@
-import requests
+import itertools
 import time
 import json
 import os
 
+import http_cache
+import http_client
+import perf_log
+import session_trace
+import upload_cache
+from json_stream import iter_records, open_output
+
 BASE_URL2 = "http://100.53.20.30:8080"
 
-BASE_URL = "http://localhost:8080"
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:8080")
 
-def log_performance(endpoint, method, status, duration):
-    with open("performance.txt", "a") as f:
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"[{timestamp}] {method} {endpoint} | Status: {status} | Duration: {duration:.4f}s\n")
+# How make_request writes responses to output/: "pretty" (indented JSON, the default),
+# "raw" (body streamed to disk as received) or "ndjson" (one compact record per line)
+OUTPUT_MODE = os.environ.get("OUTPUT_MODE", "pretty")
+OUTPUT_GZIP = os.environ.get("OUTPUT_GZIP") == "1"
+STREAM_CHUNK = 64 * 1024
 
-def save_output(data, method, path):
-    os.makedirs("output", exist_ok=True)
+LIST_ENDPOINTS = [
+    ("GET", "/getAllStudents"),
+    ("GET", "/students"),
+    ("GET", "/exams/all"),
+    ("GET", "/exams"),
+    ("GET", "/getRegions"),
+    ("GET", "/regions"),
+    ("GET", "/getAllExamCentres"),
+    ("GET", "/exam-centres"),
+    ("GET", "/getAllSchools"),
+    ("GET", "/schools"),
+    ("GET", "/getAllApplications"),
+    ("GET", "/exam-applications"),
+    ("GET", "/getAllResults"),
+    ("GET", "/exam-results"),
+    ("GET", "/getAllStudentProfiles"),
+    ("GET", "/studentProfiles"),
+]
+
+# Legacy list endpoint -> its New/RESTful (paginated) twin
+LEGACY_TWINS = {
+    "/getAllStudents": "/students",
+    "/exams/all": "/exams",
+    "/getRegions": "/regions",
+    "/getAllExamCentres": "/exam-centres",
+    "/getAllSchools": "/schools",
+    "/getAllApplications": "/exam-applications",
+    "/getAllResults": "/exam-results",
+    "/getAllStudentProfiles": "/studentProfiles",
+}
+
+# Default pagination sent to the New/RESTful list endpoints
+DEFAULT_PAGE_PARAMS = {"page": "0", "size": "20"}
+
+def list_params(path):
+    # Legacy /getAll* style endpoints take no pagination
+    return dict(DEFAULT_PAGE_PARAMS) if not path.startswith("/get") else None
+
+def log_performance(endpoint, method, params, response, timing, cache=None, size=None):
+    if size is None:
+        size = len(response.content)
+    perf_log.record(endpoint, method, params, response.status_code, size, timing, cache=cache)
+
+def output_filepath(method, path, ext):
     # Sanitize path: remove leading slash, replace remaining slashes/special chars
     clean_path = path.strip("/").replace("/", "_").replace("?", "_").replace("&", "_").replace("=", "_")
     if not clean_path: clean_path = "root"
-    
-    filename = f"{method}_{clean_path}.json"
-    filepath = os.path.join("output", filename)
+    return os.path.join("output", f"{method}_{clean_path}.{ext}")
+
+def save_output(data, method, path):
+    os.makedirs("output", exist_ok=True)
+    filepath = output_filepath(method, path, "json")
     
     with open(filepath, "w") as f:
         json.dump(data, f, indent=4)
     print(f"\nResult saved to {filepath}")
 
+def save_output_stream(response, method, path):
+    # Writes the body to disk while it downloads, never holding the parsed document
+    os.makedirs("output", exist_ok=True)
+    is_json = "json" in response.headers.get("Content-Type", "")
+    if OUTPUT_MODE == "ndjson" and is_json:
+        ext = "ndjson"
+    else:
+        ext = "json" if is_json else "txt"
+    if OUTPUT_GZIP: ext += ".gz"
+    filepath = output_filepath(method, path, ext)
+
+    counter = {"bytes": 0, "records": None}
+    def chunks():
+        for chunk in response.iter_content(STREAM_CHUNK):
+            counter["bytes"] += len(chunk)
+            yield chunk
+
+    with open_output(filepath, "wb") as f:
+        if ext.startswith("ndjson"):
+            counter["records"] = 0
+            for record in iter_records(chunks()):
+                f.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                counter["records"] += 1
+        else:
+            for chunk in chunks():
+                f.write(chunk)
+    print(f"\nResult saved to {filepath}")
+    return filepath, counter["bytes"], counter["records"]
+
+SUPPORTED_METHODS = ("GET", "POST", "PUT", "DELETE")
+
+def send_request(method, path, params=None, body=None, stream=False, headers=None):
+    if method not in SUPPORTED_METHODS:
+        raise ValueError(f"Unsupported method: {method}")
+    url = f"{BASE_URL}{path}"
+    if http_cache.ENABLED and method == "GET" and not stream:
+        return http_cache.request(url, path, params=params, headers=headers)
+    json_body = body if method in ("POST", "PUT") else None
+    if not http_cache.ENABLED or method == "GET":
+        return http_client.request(method, url, params=params, json=json_body, stream=stream, headers=headers)
+    try:
+        return http_client.request(method, url, params=params, json=json_body, stream=stream, headers=headers)
+    finally:
+        # A write shows up under other paths too (POST /addStudent in /getAllStudents, /students, ...),
+        # so every cached GET is dropped once it has been sent, even if it failed part way
+        http_cache.clear()
+
 def make_request(method, path, params=None, body=None):
     url = f"{BASE_URL}{path}"
     print(f"\nMaking {method} request to {url}...")
     
-    start_time = time.time()
+    if method not in SUPPORTED_METHODS:
+        print("Unsupported method")
+        return
+
     try:
-        if method == "GET":
-            response = requests.get(url, params=params)
-        elif method == "POST":
-            response = requests.post(url, json=body, params=params)
-        elif method == "PUT":
-            response = requests.put(url, json=body, params=params)
-        elif method == "DELETE":
-            response = requests.delete(url, params=params)
-        else:
-            print("Unsupported method")
-            return
+        if OUTPUT_MODE != "pretty":
+            return make_streamed_request(method, path, params=params, body=body)
 
-        end_time = time.time()
-        duration = end_time - start_time
+        response, timing = send_request(method, path, params=params, body=body)
+        duration = timing["total"]
         
         status = response.status_code
-        log_performance(path, method, status, duration)
+        log_performance(path, method, params, response, timing)
+        created = session_trace.created_ids(response.content, params, body) if method == "POST" else None
+        session_trace.record(method, path, params, body, status, len(response.content), duration, created=created)
         
         print(f"Status Code: {status}")
-        print(f"Time Taken: {duration:.4f}s")
+        print(f"Time Taken: {duration:.4f}s (connect {timing['connect']:.4f}s, server {timing['server']:.4f}s)")
         
         try:
             result = response.json()
@@ -68,6 +163,26 @@ def make_request(method, path, params=None, body=None):
     except Exception as e:
         print(f"Error: {e}")
 
+def make_streamed_request(method, path, params=None, body=None):
+    response, timing = send_request(method, path, params=params, body=body, stream=True)
+    with response:
+        start = time.perf_counter()
+        filepath, size, records = save_output_stream(response, method, path)
+        timing["total"] += time.perf_counter() - start
+    log_performance(path, method, params, response, timing, size=size)
+    created = None
+    if session_trace.TRACE_PATH and method == "POST":
+        # The body is only on disk; a POST response is one small object
+        with open_output(filepath, "rb") as f:
+            created = session_trace.created_ids(f.read(), params, body)
+    session_trace.record(method, path, params, body, response.status_code, size, timing["total"], created=created)
+
+    print(f"Status Code: {response.status_code}")
+    print(f"Time Taken: {timing['total']:.4f}s (connect {timing['connect']:.4f}s, server {timing['server']:.4f}s)")
+    if records is not None:
+        print(f"Records: {records}")
+    return {"saved": filepath, "bytes": size, "records": records}
+
 def get_input(prompt, default=None):
     val = input(f"{prompt} [{default}]: " if default else f"{prompt}: ")
     return val if val else default
@@ -79,6 +194,13 @@ def get_pagination_params():
         "sort": get_input("Sort (e.g. id,desc) (optional)")
     }
 
+_upload_seq = itertools.count()
+
+def make_unique_filename(original_filename):
+    # Add unique prefix to avoid duplicate upload failure in MinIO; the counter keeps
+    # names distinct when several uploads start within the same second
+    return f"{int(time.time())}_{next(_upload_seq)}_{original_filename}"
+
 def handle_file_upload(file_path):
     if not os.path.exists(file_path):
         print(f"File not found: {file_path}")
@@ -86,26 +208,36 @@ def handle_file_upload(file_path):
     
     url = f"{BASE_URL}/files/upload"
     original_filename = os.path.basename(file_path)
-    # Add unique prefix to avoid duplicate upload failure in MinIO
-    prefix = int(time.time())
-    unique_filename = f"{prefix}_{original_filename}"
+    digest = upload_cache.file_digest(file_path)
+    cached_url = upload_cache.lookup(digest, BASE_URL)
+    if cached_url:
+        print(f"Cache hit {original_filename} -> {cached_url}")
+        return cached_url
+    unique_filename = make_unique_filename(original_filename)
     
     print(f"Uploading {unique_filename}...")
     try:
         with open(file_path, 'rb') as f:
             # Send with the unique filename
             files = [('files', (unique_filename, f, 'image/jpeg'))]
-            response = requests.post(url, files=files)
+            response, timing = http_client.request("POST", url, files=files)
+            upload_url = None
             if response.status_code == 200:
                 result = response.json()
                 # Backend returns Map<OriginalFilename, URL> - the key matches unique_filename sent
                 upload_url = result.get(unique_filename)
                 if not upload_url and isinstance(result, dict):
                     upload_url = next(iter(result.values())) if result else None
+            session_trace.record("POST", "/files/upload", None, None, response.status_code, len(response.content),
+                                 timing["total"], upload={"file": os.path.abspath(file_path),
+                                                          "size": os.path.getsize(file_path), "sha256": digest,
+                                                          "field": "files", "content_type": "image/jpeg",
+                                                          "url": upload_url})
                 
-                if upload_url:
-                    print(f"Uploaded -> {upload_url}")
-                    return upload_url
+            if upload_url:
+                print(f"Uploaded -> {upload_url}")
+                upload_cache.store(digest, upload_url, unique_filename, file_path, BASE_URL)
+                return upload_url
             print(f"Upload failed: {response.status_code} - {response.text}")
     except Exception as e:
         print(f"Error: {e}")
@@ -442,32 +574,10 @@ def test_result_endpoints():
 def test_all_endpoints():
     print("\n--- Running All List Endpoints ---")
     
-    endpoints = [
-        ("GET", "/getAllStudents"),
-        ("GET", "/students"),
-        ("GET", "/exams/all"),
-        ("GET", "/exams"),
-        ("GET", "/getRegions"),
-        ("GET", "/regions"),
-        ("GET", "/getAllExamCentres"),
-        ("GET", "/exam-centres"),
-        ("GET", "/getAllSchools"),
-        ("GET", "/schools"),
-        ("GET", "/getAllApplications"),
-        ("GET", "/exam-applications"),
-        ("GET", "/getAllResults"),
-        ("GET", "/exam-results"),
-        ("GET", "/getAllStudentProfiles"),
-        ("GET", "/studentProfiles"),
-    ]
-    
-    # Use default pagination for New/RESTful endpoints
-    params = {"page": "0", "size": "20"}
-    
-    for method, path in endpoints:
-        p = params if path.startswith(("/", "/students", "/exams", "/regions", "/exam-centres", "/schools", "/exam-applications", "/exam-results")) and not path.startswith("/get") else None
-        make_request(method, path, params=p)
+    for method, path in LIST_ENDPOINTS:
+        make_request(method, path, params=list_params(path))
         time.sleep(0.5)  # Small delay between requests
+    http_cache.print_stats()
 
 def main():
     while True:
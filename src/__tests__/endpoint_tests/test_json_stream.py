@@ -0,0 +1,40 @@
+import unittest
+
+from json_stream import iter_records
+
+def split_every(text, size):
+    data = text.encode()
+    return iter([data[i:i + size] for i in range(0, len(data), size)])
+
+class ChunkBoundaryTest(unittest.TestCase):
+    # Values split across chunks must decode the same as when they arrive in one piece
+
+    def test_decimal_split_after_point(self):
+        self.assertEqual(list(iter_records(iter([b'{"content":[2500.', b'0]}']))), [2500.0])
+
+    def test_exponent_split_after_e(self):
+        self.assertEqual(list(iter_records(iter([b'[1e', b'5]']))), [1e5])
+
+    def test_exponent_split_after_sign(self):
+        self.assertEqual(list(iter_records(iter([b'[1.5e-', b'3, 2]']))), [1.5e-3, 2])
+
+    def test_number_split_between_digits(self):
+        self.assertEqual(list(iter_records(iter([b'[12', b'34]']))), [1234])
+
+    def test_every_split_point(self):
+        text = '{"totalElements":3,"content":[{"id":1,"fee":2500.75},{"id":2,"fee":-1.5E+2,"ok":true},' \
+               '{"id":3,"name":"café","fee":null}]}'
+        expected = [{"id": 1, "fee": 2500.75}, {"id": 2, "fee": -150.0, "ok": True},
+                    {"id": 3, "name": "café", "fee": None}]
+        for size in range(1, len(text.encode()) + 1):
+            with self.subTest(size=size):
+                self.assertEqual(list(iter_records(split_every(text, size))), expected)
+
+    def test_single_object_and_scalar(self):
+        self.assertEqual(list(iter_records(split_every('{"studentId":12,"name":"A"}', 3))),
+                         [{"studentId": 12, "name": "A"}])
+        self.assertEqual(list(iter_records(split_every("42.5", 1))), [42.5])
+        self.assertEqual(list(iter_records(iter([]))), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import test
+from test import LEGACY_TWINS, send_request, log_performance
+from paginate import ID_FIELDS, iter_records
+from profiler import records_of
+
+def fetch_legacy(path):
+    start = time.perf_counter()
+    response, timing = send_request("GET", path)
+    log_performance(path, "GET", None, response, timing)
+    response.raise_for_status()
+    records = records_of(response.json())
+    return records, len(response.content), time.perf_counter() - start
+
+def fetch_restful(path, size, concurrency, id_field):
+    # Sorted by ID so concurrent page fetches see a stable order
+    stats = {}
+    start = time.perf_counter()
+    records = list(iter_records(path, size, concurrency, {"sort": f"{id_field},asc"}, stats))
+    return records, stats["bytes"], time.perf_counter() - start, stats["pages"]
+
+def peak_memory(fn, *args):
+    # Separate pass under tracemalloc, which would distort the timed run
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def compare_ids(legacy, restful, id_field):
+    legacy_ids = [r.get(id_field) for r in legacy if isinstance(r, dict)]
+    restful_ids = [r.get(id_field) for r in restful if isinstance(r, dict)]
+    legacy_set, restful_set = set(legacy_ids), set(restful_ids)
+    legacy_fields = set().union(*(r.keys() for r in legacy if isinstance(r, dict)))
+    restful_fields = set().union(*(r.keys() for r in restful if isinstance(r, dict)))
+    return {
+        "legacy_records": len(legacy_ids),
+        "restful_records": len(restful_ids),
+        "missing_in_restful": sorted(legacy_set - restful_set, key=str),
+        "missing_in_legacy": sorted(restful_set - legacy_set, key=str),
+        "restful_duplicates": len(restful_ids) - len(restful_set),
+        "legacy_only_fields": sorted(legacy_fields - restful_fields),
+    }
+
+def check_twin(legacy_path, restful_path, size, concurrency, memory):
+    id_field = ID_FIELDS[restful_path]
+    legacy, legacy_bytes, legacy_time = fetch_legacy(legacy_path)
+    restful, restful_bytes, restful_time, pages = fetch_restful(restful_path, size, concurrency, id_field)
+    result = {
+        "legacy": legacy_path, "restful": restful_path, "id_field": id_field,
+        "legacy_time": legacy_time, "restful_time": restful_time, "restful_pages": pages,
+        "legacy_bytes": legacy_bytes, "restful_bytes": restful_bytes,
+    }
+    result.update(compare_ids(legacy, restful, id_field))
+    result["match"] = not (result["missing_in_restful"] or result["missing_in_legacy"]
+                           or result["restful_duplicates"])
+    if memory:
+        result["legacy_peak_memory"] = peak_memory(fetch_legacy, legacy_path)
+        result["restful_peak_memory"] = peak_memory(fetch_restful, restful_path, size, concurrency, id_field)
+    return result
+
+def print_report(results):
+    print(f"\n{'Legacy -> RESTful':<42}{'Records':>13}{'Time':>17}{'KB':>15}{'Peak MB':>13}  Parity")
+    for r in results:
+        if "error" in r:
+            print(f"{r['legacy'] + ' -> ' + r['restful']:<42}{'-':>13}{'-':>17}{'-':>15}{'-':>13}  ERROR: {r['error']}")
+            continue
+        records = f"{r['legacy_records']}/{r['restful_records']}"
+        times = f"{r['legacy_time']:.2f}s/{r['restful_time']:.2f}s"
+        size = f"{r['legacy_bytes'] / 1024:.0f}/{r['restful_bytes'] / 1024:.0f}"
+        memory = "-"
+        if "legacy_peak_memory" in r:
+            memory = f"{r['legacy_peak_memory'] / 1e6:.1f}/{r['restful_peak_memory'] / 1e6:.1f}"
+        parity = "ok" if r["match"] else (
+            f"MISMATCH ({len(r['missing_in_restful'])} missing in RESTful, "
+            f"{len(r['missing_in_legacy'])} missing in legacy, {r['restful_duplicates']} duplicates)")
+        print(f"{r['legacy'] + ' -> ' + r['restful']:<42}{records:>13}{times:>17}{size:>15}{memory:>13}  {parity}")
+        if r["legacy_only_fields"]:
+            print(f"{'':<42}legacy-only fields: {', '.join(r['legacy_only_fields'])}")
+    print("Columns are legacy/RESTful; RESTful time and bytes cover every page")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check each legacy list endpoint against its paginated RESTful twin")
+    parser.add_argument("--legacy", action="append", help="Limit to these legacy paths (repeatable)")
+    parser.add_argument("--size", type=int, default=100, help="RESTful page size")
+    parser.add_argument("--concurrency", type=int, default=4, help="RESTful pages fetched in parallel")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--out", default=os.path.join("output", "twin_parity.json"))
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    results = []
+    for legacy_path, restful_path in LEGACY_TWINS.items():
+        if args.legacy and legacy_path not in args.legacy:
+            continue
+        print(f"Comparing {legacy_path} with {restful_path}...")
+        try:
+            results.append(check_twin(legacy_path, restful_path, args.size, args.concurrency, not args.no_memory))
+        except Exception as e:
+            # An endpoint that could not be compared fails the check like a mismatch
+            print(f"{legacy_path}: Error: {e}")
+            results.append({"legacy": legacy_path, "restful": restful_path, "error": str(e), "match": False})
+    print_report(results)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=4)
+    print(f"\nResults saved to {args.out}")
+    if any(not r["match"] for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
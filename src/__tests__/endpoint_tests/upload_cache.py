@@ -0,0 +1,104 @@
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+# Maps (backend base URL, file content digest) -> URL returned by /files/upload, so unchanged files are
+# not re-uploaded; URLs from the mock server are never handed out against the real backend or vice versa
+UPLOAD_CACHE_PATH = os.environ.get("UPLOAD_CACHE_PATH", "upload_cache.sqlite")
+UPLOAD_CACHE_ENABLED = os.environ.get("UPLOAD_CACHE", "1") != "0"
+
+def _connect():
+    conn = sqlite3.connect(UPLOAD_CACHE_PATH, timeout=30)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(uploads)")]
+    if columns and "base_url" not in columns:
+        # Cache written before entries were keyed by backend: its URLs cannot be attributed, start over
+        conn.execute("DROP TABLE uploads")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS uploads ("
+        " base_url TEXT NOT NULL,"
+        " digest TEXT NOT NULL,"
+        " url TEXT NOT NULL,"
+        " object_name TEXT,"
+        " filename TEXT,"
+        " size INTEGER,"
+        " uploaded_at REAL,"
+        " PRIMARY KEY (base_url, digest))"
+    )
+    return conn
+
+@contextmanager
+def _db():
+    conn = _connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def file_digest(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+def _backend(base_url):
+    return base_url.rstrip("/")
+
+def lookup(digest, base_url):
+    if not UPLOAD_CACHE_ENABLED:
+        return None
+    with _db() as conn:
+        row = conn.execute("SELECT url FROM uploads WHERE base_url = ? AND digest = ?",
+                           (_backend(base_url), digest)).fetchone()
+    return row[0] if row else None
+
+def store(digest, url, object_name, path, base_url):
+    if not UPLOAD_CACHE_ENABLED:
+        return
+    with _db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO uploads (base_url, digest, url, object_name, filename, size, uploaded_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (_backend(base_url), digest, url, object_name, os.path.basename(path), os.path.getsize(path),
+             time.time()),
+        )
+
+def invalidate(object_name, base_url=None):
+    # Called once the object is deleted from MinIO; matches the uploaded name or the last URL segment
+    # exactly (no LIKE, so "_" and "%" in file names match only themselves)
+    tail = f"/{object_name}"
+    query = "DELETE FROM uploads WHERE (object_name = ? OR substr(url, -length(?)) = ?)"
+    args = [object_name, tail, tail]
+    if base_url is not None:
+        query += " AND base_url = ?"
+        args.append(_backend(base_url))
+    with _db() as conn:
+        cur = conn.execute(query, args)
+    return cur.rowcount
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the local upload cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show cached uploads")
+    sub.add_parser("clear", help="Forget every cached upload")
+    args = parser.parse_args()
+
+    with _db() as conn:
+        if args.command == "list":
+            for base_url, digest, url, filename, size in conn.execute(
+                "SELECT base_url, digest, url, filename, size FROM uploads ORDER BY uploaded_at"
+            ):
+                print(f"{base_url}  {digest[:12]}  {size:>10}  {filename}  -> {url}")
+        elif args.command == "clear":
+            count = conn.execute("DELETE FROM uploads").rowcount
+            print(f"Removed {count} cached uploads")
+
+if __name__ == "__main__":
+    main()
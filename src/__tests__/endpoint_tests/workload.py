@@ -0,0 +1,187 @@
+import argparse
+import os
+import random
+import threading
+import time
+import uuid
+
+import http_client
+import test
+from test import send_request, log_performance, make_unique_filename
+from scenario import load_scenario, render
+from seed import student_payload, application_payload, result_payload, exam_payload
+from stats import Histogram, fmt_seconds
+
+DEFAULT_THINK = 1.0
+WRITE_METHODS = ("POST", "PUT", "DELETE")
+
+# Body builders reuse the seeder's payloads, which match what the interactive menus send
+BUILDERS = {
+    "student": lambda rng, v: student_payload(rng, v["request_id"], v.get("seed", 0)),
+    "exam": lambda rng, v: exam_payload(rng, v["request_id"]),
+    "application": lambda rng, v: application_payload(rng, v["studentId"], v["examNo"]),
+    "result": lambda rng, v: result_payload(rng, v["applicationId"]),
+}
+
+class WorkloadError(Exception):
+    pass
+
+def load_mix(path):
+    mix = load_scenario(path)
+    if not mix.get("requests"):
+        raise WorkloadError(f"{path} defines no requests")
+    for entry in mix["requests"]:
+        entry.setdefault("name", f"{entry.get('method', 'GET')} {entry['path']}")
+        if entry.get("builder") and entry["builder"] not in BUILDERS:
+            raise WorkloadError(f"Unknown body builder '{entry['builder']}' (have: {', '.join(BUILDERS)})")
+    return mix
+
+def request_vars(mix, rng, user, iteration):
+    # Fresh draws per request: "ranges" pick an int in [lo, hi], "choices" pick one option ("" = filter unset)
+    variables = dict(mix.get("variables") or {})
+    variables.update({
+        "user": user,
+        "iteration": iteration,
+        "timestamp": int(time.time()),
+        "now": time.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "uuid": uuid.uuid4().hex[:8],
+        "request_id": rng.randrange(10 ** 9),
+    })
+    for name, (lo, hi) in (mix.get("ranges") or {}).items():
+        variables[name] = rng.randint(lo, hi)
+    for name, options in (mix.get("choices") or {}).items():
+        variables[name] = render(rng.choice(options), variables)
+    return variables
+
+def think_time(entry, mix, rng):
+    think = entry.get("think", mix.get("think", DEFAULT_THINK))
+    if isinstance(think, list):
+        return rng.uniform(*think)
+    return think
+
+class MixStats:
+    def __init__(self, names):
+        self.lock = threading.Lock()
+        self.entries = {name: {"count": 0, "histogram": Histogram(), "errors": 0, "hits": 0,
+                                "misses": 0} for name in names}
+
+    def add(self, name, elapsed, ok, cache_header):
+        with self.lock:
+            entry = self.entries[name]
+            entry["count"] += 1
+            if elapsed is not None:
+                entry["histogram"].record(elapsed)
+            if not ok:
+                entry["errors"] += 1
+            if cache_header == "HIT":
+                entry["hits"] += 1
+            elif cache_header == "MISS":
+                entry["misses"] += 1
+
+def send_upload(entry, variables):
+    size = entry.get("upload_bytes", 4096)
+    name = make_unique_filename(render(entry.get("filename", "workload.bin"), variables))
+    files = [("files", (name, os.urandom(size), "application/octet-stream"))]
+    return http_client.request("POST", f"{test.BASE_URL}{entry['path']}", files=files)
+
+def send_entry(entry, variables, rng):
+    method = entry.get("method", "GET").upper()
+    path = render(entry["path"], variables)
+    params = render(entry.get("params"), variables)
+    if params:
+        params = {k: v for k, v in params.items() if v not in (None, "")}
+    if entry.get("upload_bytes"):
+        response, timing = send_upload(entry, variables)
+    else:
+        if entry.get("builder"):
+            body = BUILDERS[entry["builder"]](rng, variables)
+        else:
+            body = render(entry.get("body"), variables)
+        response, timing = send_request(method, path, params=params, body=body)
+    log_performance(path, method, params, response, timing)
+    return response, timing
+
+def run_mix(mix, users, duration, seed=0):
+    entries = mix["requests"]
+    weights = [e.get("weight", 1) for e in entries]
+    stats = MixStats([e["name"] for e in entries])
+    deadline = time.time() + duration
+
+    def virtual_user(user):
+        rng = random.Random(f"{seed}:{user}")
+        iteration = 0
+        while time.time() < deadline:
+            entry = rng.choices(entries, weights)[0]
+            variables = request_vars(mix, rng, user, iteration)
+            try:
+                response, timing = send_entry(entry, variables, rng)
+                stats.add(entry["name"], timing["total"], response.status_code < 400,
+                          response.headers.get("X-Cache"))
+            except Exception:
+                stats.add(entry["name"], None, False, None)
+            iteration += 1
+            pause = min(think_time(entry, mix, rng), deadline - time.time())
+            if pause > 0:
+                time.sleep(pause)
+
+    print(f"\n--- Workload: {mix.get('name', 'unnamed')} ({users} virtual users, {duration}s) ---")
+    start = time.time()
+    threads = [threading.Thread(target=virtual_user, args=(u,), daemon=True) for u in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return stats, time.time() - start
+
+def print_report(mix, stats, elapsed):
+    total_weight = sum(e.get("weight", 1) for e in mix["requests"])
+    counts = {name: e["count"] for name, e in stats.entries.items()}
+    total = sum(counts.values()) or 1
+    print(f"\n{'Request':<30}{'Target':>8}{'Actual':>8}{'Count':>7}{'Err':>6}{'Hit%':>6}"
+          f"{'p50':>11}{'p95':>11}{'p99':>11}")
+    reads = writes = 0
+    for entry_def in mix["requests"]:
+        name = entry_def["name"]
+        entry = stats.entries[name]
+        hist = entry["histogram"]
+        cached = entry["hits"] + entry["misses"]
+        hit = f"{entry['hits'] / cached:.0%}" if cached else "-"
+        if entry_def.get("method", "GET").upper() in WRITE_METHODS:
+            writes += counts[name]
+        else:
+            reads += counts[name]
+        print(f"{name:<30}{entry_def.get('weight', 1) / total_weight:>8.0%}{counts[name] / total:>8.0%}"
+              f"{counts[name]:>7}{entry['errors']:>6}{hit:>6}{fmt_seconds(hist.percentile(50)):>11}"
+              f"{fmt_seconds(hist.percentile(95)):>11}{fmt_seconds(hist.percentile(99)):>11}")
+    print(f"\n{reads + writes} requests in {elapsed:.2f}s ({(reads + writes) / elapsed:.2f} req/s), "
+          f"read/write {reads}:{writes}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Weighted mixed read/write workload driven by virtual users")
+    parser.add_argument("mix", help="Workload mix file (.json, or .yaml with PyYAML installed)")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the per-user random streams")
+    parser.add_argument("--think-scale", type=float, default=1.0, help="Multiply every think time (0 = no pauses)")
+    parser.add_argument("--var", action="append", default=[], help="Set a variable, e.g. --var examNo=3")
+    parser.add_argument("--base-url", default=test.BASE_URL)
+    args = parser.parse_args()
+
+    test.BASE_URL = args.base_url
+    mix = load_mix(args.mix)
+    for assignment in args.var:
+        name, _, value = assignment.partition("=")
+        mix.setdefault("variables", {})[name] = int(value) if value.isdigit() else value
+    mix["variables"] = dict(mix.get("variables") or {}, seed=args.seed)
+    if args.think_scale != 1.0:
+        scale = lambda t: [x * args.think_scale for x in t] if isinstance(t, list) else t * args.think_scale
+        mix["think"] = scale(mix.get("think", DEFAULT_THINK))
+        for entry in mix["requests"]:
+            if "think" in entry:
+                entry["think"] = scale(entry["think"])
+    http_client.configure(pool_size=max(args.users, http_client.POOL_SIZE))
+    stats, elapsed = run_mix(mix, args.users, args.duration, args.seed)
+    print_report(mix, stats, elapsed)
+
+if __name__ == "__main__":
+    main()